@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Startup Benchmark - cold start budget for the plain search path
+Usage: python bench_startup.py [--runs 10] [--budget-ms MS] [--query "<query>"] [--json]
+
+Runs `python -X importtime search.py "<query>" --domain style` in fresh
+processes (after one warm-up run that builds the indexes) and reports:
+  - import time of the modules search.py imports itself, i.e. everything
+    after interpreter startup (site), from -X importtime
+  - wall-clock time from process spawn to the first line of output
+
+Exits with status 1 when a module that must stay lazy (LAZY_MODULES) is
+imported by a plain search. Wall-clock times depend on the machine and the
+Python version, so the import time budget is only checked when --budget-ms
+is given (calibrate it on the machine that runs the check).
+Run without PYTHONDONTWRITEBYTECODE so numbers reflect cached bytecode.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+# ============ CONFIGURATION ============
+SEARCH_SCRIPT = Path(__file__).parent / "search.py"
+DEFAULT_QUERY = "glassmorphism dark mode"
+
+# Only needed for --design-system, --serve, --batch --jobs, index rebuilds or the NumPy backend
+LAZY_MODULES = ("design_system", "server", "csv", "hashlib", "concurrent.futures", "numpy")
+
+
+# ============ MEASUREMENT ============
+def parse_importtime(stderr: str) -> tuple:
+    """Parse -X importtime output.
+
+    Returns ({top-level module: cumulative us}, {every module}) for imports
+    that happen after site, i.e. the ones triggered by the script.
+    """
+    top_level = {}
+    modules = set()
+    after_site = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header line
+        cumulative = int(parts[1])
+        name = parts[2].rstrip()
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        if not after_site:
+            after_site = depth == 0 and module == "site"
+            continue
+        modules.add(module)
+        if depth == 0:
+            top_level[module] = cumulative
+    return top_level, modules
+
+
+def run_once(query: str) -> dict:
+    """One fresh search.py process: import times and time to first output."""
+    cmd = [sys.executable, "-X", "importtime", str(SEARCH_SCRIPT), query, "--domain", "style"]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+    first_line = proc.stdout.readline()
+    first_output_ms = (time.perf_counter() - start) * 1000
+    rest, stderr = proc.communicate()
+    if proc.returncode != 0 or not first_line:
+        raise RuntimeError(f"search.py failed ({proc.returncode}): {stderr[-500:]}")
+
+    top_level, modules = parse_importtime(stderr)
+    return {
+        "import_ms": sum(top_level.values()) / 1000,
+        "first_output_ms": first_output_ms,
+        "top_level": top_level,
+        "modules": modules
+    }
+
+
+def benchmark(query: str = DEFAULT_QUERY, runs: int = 10, budget_ms: float = None) -> dict:
+    """Measure the plain search path and check it against the budget, if any."""
+    run_once(query)  # Warm-up: builds prebuilt indexes and bytecode caches
+    samples = [run_once(query) for _ in range(runs)]
+
+    import_ms = [s["import_ms"] for s in samples]
+    first_output_ms = [s["first_output_ms"] for s in samples]
+    module_names = sorted(set().union(*(s["top_level"] for s in samples)))
+    lazy_violations = sorted(m for m in LAZY_MODULES if any(m in s["modules"] for s in samples))
+
+    return {
+        "query": query,
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "budget_ms": budget_ms,
+        "import_ms": {"median": statistics.median(import_ms), "min": min(import_ms), "max": max(import_ms)},
+        "first_output_ms": {"median": statistics.median(first_output_ms), "min": min(first_output_ms), "max": max(first_output_ms)},
+        "top_level_imports_ms": {
+            name: statistics.median(s["top_level"].get(name, 0) for s in samples) / 1000 for name in module_names
+        },
+        "lazy_violations": lazy_violations,
+        "ok": (budget_ms is None or statistics.median(import_ms) <= budget_ms) and not lazy_violations
+    }
+
+
+def format_report(report: dict) -> str:
+    """Human-readable summary."""
+    budget = f"{report['budget_ms']:.1f} ms" if report["budget_ms"] is not None else "none"
+    lines = [
+        "## search.py startup",
+        f"**Runs:** {report['runs']} | **Python:** {report['python']} | **Budget:** {budget}",
+        f"- Script imports: {report['import_ms']['median']:.1f} ms median ({report['import_ms']['min']:.1f}-{report['import_ms']['max']:.1f})",
+        f"- First output:   {report['first_output_ms']['median']:.1f} ms median ({report['first_output_ms']['min']:.1f}-{report['first_output_ms']['max']:.1f})",
+        "- Top-level imports:"
+    ]
+    for name, ms in sorted(report["top_level_imports_ms"].items(), key=lambda x: -x[1]):
+        lines.append(f"    {name:<20} {ms:6.2f} ms")
+    if report["lazy_violations"]:
+        lines.append(f"- Lazy modules imported eagerly: {', '.join(report['lazy_violations'])}")
+    lines.append("PASS" if report["ok"] else "FAIL")
+    return "\n".join(lines)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max startup benchmark")
+    parser.add_argument("--query", "-q", type=str, default=DEFAULT_QUERY, help="Query to search")
+    parser.add_argument("--runs", "-r", type=int, default=10, help="Measured runs (default: 10)")
+    parser.add_argument("--budget-ms", "-b", type=float, default=None, help="Fail when the median import time exceeds this (default: not checked)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if os.environ.get("PYTHONDONTWRITEBYTECODE"):
+        print("Warning: PYTHONDONTWRITEBYTECODE is set; import times include compilation.", file=sys.stderr)
+
+    report = benchmark(args.query, args.runs, args.budget_ms)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    sys.exit(0 if report["ok"] else 1)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - reproducible performance numbers for the search engine
+Usage: python benchmark.py [--sizes 10000,100000] [--jobs 4] [--output results.json]
+       python benchmark.py --sizes 10000,100000,1000000 --output results.json
+       python benchmark.py --compare base.json new.json [--threshold 10]
+
+Covers, against the shipped data/*.csv (per domain and per stack):
+  - cold start: fresh search.py process (see bench_startup.py), index build
+    from CSV and index load from data/.index
+  - warm queries: search() with indexes in memory (uncached and cached)
+  - batch throughput: search_many() sequential and across a process pool
+  - memory peak: tracemalloc peak while loading each index
+  - DesignSystemGenerator.generate, cold and warm
+and against synthetic corpora of the given sizes: index build, load, BM25.fit,
+BM25.score per backend, and memory peak.
+
+Results are a flat JSON dict of metrics ("<group>.<name>.<unit>") plus run
+metadata, so two runs can be compared with --compare. Lower is better for
+every metric except *_qps.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import core
+from core import CSV_CONFIG, STACK_CONFIG, _STACK_COLS, DATA_DIR, MAX_RESULTS, BM25
+
+
+# ============ CONFIGURATION ============
+SEED = 42
+DEFAULT_SIZES = [10_000, 100_000]
+QUERIES = [
+    "saas dashboard", "glassmorphism dark mode", "elegant luxury serif", "animation accessibility",
+    "fintech crypto", "beauty spa wellness service", "e-commerce luxury", "layout responsive form",
+    "real-time chart trend", "icon navigation", "memo rerender bundle", "aria focus keyboard",
+    "landing hero pricing cta", "healthcare app mobile", "minimal clean portfolio", "playful gaming"
+]
+BATCH_SIZE = 512
+SYNTHETIC_VOCAB = 5000
+SYNTHETIC_COLS = {
+    "search_cols": ["Name", "Keywords", "Description"],
+    "output_cols": ["Name", "Keywords", "Description", "Notes"]
+}
+
+
+# ============ HELPERS ============
+def _median_time(fn, repeat: int) -> float:
+    """Median wall time of fn() in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _peak_kb(fn) -> float:
+    """Peak traced allocation while running fn(), in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _targets() -> list:
+    """(name, filepath, search_cols, output_cols) for every shipped domain and stack."""
+    targets = [(f"domain.{domain}", DATA_DIR / config["file"], config["search_cols"], config["output_cols"])
+               for domain, config in CSV_CONFIG.items()]
+    targets += [(f"stack.{stack}", DATA_DIR / config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
+                for stack, config in STACK_CONFIG.items()]
+    return [t for t in targets if t[1].exists()]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+# ============ SHIPPED DATA ============
+def bench_index(metrics: dict, index_dir: Path, repeat: int):
+    """Index build / load time and load memory peak per domain and stack."""
+    for name, filepath, search_cols, output_cols in _targets():
+        path = core._index_path(filepath, search_cols, output_cols)
+
+        def build():
+            path.unlink(missing_ok=True)
+            core._load_index(filepath, search_cols, output_cols)
+
+        metrics[f"index_build.{name}.ms"] = _median_time(build, repeat) * 1000
+        metrics[f"index_load.{name}.ms"] = _median_time(lambda: core._load_index(filepath, search_cols, output_cols), repeat) * 1000
+        metrics[f"memory_peak.{name}.kb"] = _peak_kb(lambda: core._load_index(filepath, search_cols, output_cols))
+    _log(f"  index build/load/memory: {len(_targets())} files (index dir {index_dir})")
+
+
+def bench_queries(metrics: dict, repeat: int):
+    """Warm (indexes in memory, results uncached) and cached query latency."""
+    core.preload()
+    for name, filepath, search_cols, output_cols in _targets():
+        def uncached():
+            for query in QUERIES:
+                core._result_cache.clear()
+                core._search_csv(filepath, search_cols, output_cols, query, MAX_RESULTS)
+
+        def cached():
+            for query in QUERIES:
+                core._search_csv(filepath, search_cols, output_cols, query, MAX_RESULTS)
+
+        cached()
+        metrics[f"query_warm.{name}.us"] = _median_time(uncached, repeat) / len(QUERIES) * 1e6
+        metrics[f"query_cached.{name}.us"] = _median_time(cached, repeat) / len(QUERIES) * 1e6
+    _log("  warm/cached queries done")
+
+
+def bench_batch(metrics: dict, jobs: int):
+    """search_many throughput over unique queries, sequential and pooled."""
+    rng = random.Random(SEED)
+    words = sorted({word for query in QUERIES for word in query.split()})
+    domains = list(CSV_CONFIG)
+    batch = [{"query": " ".join(rng.sample(words, 3)), "domain": domains[i % len(domains)]} for i in range(BATCH_SIZE)]
+
+    core.clear_cache()
+    elapsed = _median_time(lambda: (core.clear_cache(), core.search_many(batch)), 1)
+    metrics["batch.sequential.qps"] = BATCH_SIZE / elapsed
+    if jobs > 1:
+        elapsed = _median_time(lambda: core.search_many(batch, workers=jobs), 1)
+        metrics[f"batch.workers{jobs}.qps"] = BATCH_SIZE / elapsed
+    _log(f"  batch throughput done ({BATCH_SIZE} queries)")
+
+
+def bench_generate(metrics: dict, repeat: int):
+    """DesignSystemGenerator.generate with cold and warm in-process caches."""
+    from design_system import DesignSystemGenerator
+
+    def cold():
+        core.clear_cache()
+        DesignSystemGenerator().generate("fintech crypto dashboard")
+
+    metrics["generate.cold.ms"] = _median_time(cold, repeat) * 1000
+    generator = DesignSystemGenerator()
+    metrics["generate.warm.ms"] = _median_time(lambda: [generator.generate(q) for q in QUERIES], repeat) / len(QUERIES) * 1000
+    _log("  design system generation done")
+
+
+def bench_cold_start(metrics: dict, runs: int):
+    """Fresh search.py process: import time and time to first output."""
+    from bench_startup import benchmark as startup_benchmark
+    report = startup_benchmark(runs=runs)
+    metrics["cold_start.imports.ms"] = report["import_ms"]["median"]
+    metrics["cold_start.first_output.ms"] = report["first_output_ms"]["median"]
+    _log("  process cold start done")
+
+
+# ============ SYNTHETIC CORPORA ============
+def write_synthetic_csv(path: Path, rows: int):
+    """Deterministic CSV with Zipf-distributed vocabulary."""
+    import csv
+    rng = random.Random(SEED)
+    vocab = [f"term{i}" for i in range(SYNTHETIC_VOCAB)]
+    weights = [1 / (i + 1) for i in range(SYNTHETIC_VOCAB)]
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SYNTHETIC_COLS["output_cols"])
+        for i in range(rows):
+            words = rng.choices(vocab, weights, k=24)
+            writer.writerow([f"item{i} {words[0]}", ", ".join(words[1:6]), " ".join(words[6:20]), " ".join(words[20:])])
+
+
+def bench_synthetic(metrics: dict, sizes: list, work_dir: Path):
+    """Build, load, fit and score synthetic corpora for every available backend."""
+    rng = random.Random(SEED + 1)
+    queries = [" ".join(f"term{rng.randrange(SYNTHETIC_VOCAB // 10)}" for _ in range(3)) for _ in range(50)]
+    backends = ["python"] + (["numpy"] if core._import_numpy() is not None else [])
+    search_cols, output_cols = SYNTHETIC_COLS["search_cols"], SYNTHETIC_COLS["output_cols"]
+
+    for size in sizes:
+        filepath = work_dir / f"synthetic-{size}.csv"
+        write_synthetic_csv(filepath, size)
+        prefix = f"synthetic_{size}"
+
+        start = time.perf_counter()
+        core._load_index(filepath, search_cols, output_cols)
+        metrics[f"{prefix}.index_build.ms"] = (time.perf_counter() - start) * 1000
+
+        holder = {}
+        start = time.perf_counter()
+        holder["index"] = core._load_index(filepath, search_cols, output_cols)
+        metrics[f"{prefix}.index_load.ms"] = (time.perf_counter() - start) * 1000
+        metrics[f"{prefix}.memory_peak.kb"] = _peak_kb(lambda: core._load_index(filepath, search_cols, output_cols))
+
+        table = holder["index"]["table"]
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in table]
+        start = time.perf_counter()
+        BM25().fit(documents)
+        metrics[f"{prefix}.bm25_fit.ms"] = (time.perf_counter() - start) * 1000
+
+        state = holder["index"]["bm25"].to_dict()
+        for backend in backends:
+            bm25 = BM25.from_dict(state)
+            bm25.backend = backend
+            bm25.score(queries[0], MAX_RESULTS)  # Builds the NumPy matrix outside the timing
+            elapsed = _median_time(lambda: [bm25.score(q, MAX_RESULTS) for q in queries], 3)
+            metrics[f"{prefix}.bm25_score_{backend}.us"] = elapsed / len(queries) * 1e6
+            elapsed = _median_time(lambda: bm25.score_many(queries, MAX_RESULTS), 3)
+            metrics[f"{prefix}.bm25_batch_{backend}.qps"] = len(queries) / elapsed
+
+        filepath.unlink()
+        _log(f"  synthetic {size:,} rows done")
+
+
+# ============ COMPARISON ============
+def compare(base: dict, new: dict, threshold: float) -> tuple:
+    """Per-metric deltas between two result files; returns (report, regressions)."""
+    base_metrics, new_metrics = base["metrics"], new["metrics"]
+    lines = [
+        f"## Benchmark comparison: {base['meta'].get('commit') or 'base'} -> {new['meta'].get('commit') or 'new'}",
+        f"{'metric':<52} {'base':>12} {'new':>12} {'delta':>9}"
+    ]
+    regressions = []
+    for name in sorted(set(base_metrics) & set(new_metrics)):
+        old, cur = base_metrics[name], new_metrics[name]
+        if not old:
+            continue
+        delta = (cur - old) / old * 100
+        worse = -delta if name.endswith("qps") else delta
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif worse < -threshold:
+            flag = "  improved"
+        lines.append(f"{name:<52} {old:>12.2f} {cur:>12.2f} {delta:>+8.1f}%{flag}")
+    for name in sorted(set(base_metrics) ^ set(new_metrics)):
+        lines.append(f"{name:<52} (only in {'base' if name in base_metrics else 'new'})")
+    lines.append(f"{len(regressions)} regression(s) beyond {threshold:.0f}%")
+    return "\n".join(lines), regressions
+
+
+# ============ MAIN ============
+def run(sizes: list, jobs: int, repeat: int, startup_runs: int) -> dict:
+    """Run the full suite with a throwaway index directory."""
+    metrics = {}
+    original_index_dir = core.INDEX_DIR
+    with tempfile.TemporaryDirectory(prefix="uipro-bench-") as tmp:
+        core.INDEX_DIR = Path(tmp) / "index"
+        try:
+            core.clear_cache()
+            _log("Shipped data:")
+            bench_index(metrics, core.INDEX_DIR, repeat)
+            bench_queries(metrics, repeat)
+            bench_batch(metrics, jobs)
+            bench_generate(metrics, repeat)
+            if sizes:
+                _log("Synthetic corpora:")
+                bench_synthetic(metrics, sizes, Path(tmp))
+        finally:
+            core.INDEX_DIR = original_index_dir
+            core.clear_cache()
+    if startup_runs:
+        bench_cold_start(metrics, startup_runs)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "jobs": jobs,
+            "numpy": core._import_numpy() is not None
+        },
+        "metrics": {name: round(value, 3) for name, value in metrics.items()}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max benchmark suite")
+    parser.add_argument("--sizes", type=str, default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Synthetic corpus sizes, comma-separated ('' to skip; e.g. 10000,100000,1000000)")
+    parser.add_argument("--jobs", "-j", type=int, default=min(4, os.cpu_count() or 1), help="Process pool size for batch throughput")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per timing (median is reported)")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Fresh-process runs for cold start (0 to skip)")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent for --compare")
+
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            new = json.load(f)
+        report, regressions = compare(base, new, args.threshold)
+        print(report)
+        sys.exit(1 if regressions else 0)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run(sizes, args.jobs, args.repeat, args.startup_runs)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        _log(f"Results written to {args.output}")
+    else:
+        print(output)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Client - thin client for the search server (see server.py)
+Usage: python client.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3] [--json]
+       python client.py "<query>" --design-system [-p "Project Name"] [-f markdown]
+
+Talks to a running `search.py --serve` over localhost HTTP. When no server is
+running, falls back to in-process search, so callers never need to check.
+The server address can be overridden with the UI_PRO_MAX_SERVER env variable.
+
+    from client import search, search_stack, search_domains, search_many, generate_design_system, generate_many
+    result = search("glassmorphism", "style")
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+
+
+# ============ CONFIGURATION ============
+SERVER_URL = os.environ.get("UI_PRO_MAX_SERVER", "http://127.0.0.1:8765")
+REQUEST_TIMEOUT = 30  # seconds; connection refusals fail immediately
+
+# Never route localhost calls through an HTTP proxy from the environment
+_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+class ServerUnavailable(Exception):
+    """No search server is reachable at SERVER_URL."""
+
+
+# ============ TRANSPORT ============
+def call(method: str, **params):
+    """Call a server method and return its result.
+
+    Raises ServerUnavailable when the server cannot be reached and
+    RuntimeError when the server reports an error.
+    """
+    request = urllib.request.Request(
+        f"{SERVER_URL.rstrip('/')}/{method}",
+        data=json.dumps(params).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with _opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+            payload = json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get("error", str(e))
+        except ValueError:
+            message = str(e)
+        raise RuntimeError(f"Server error ({e.code}): {message}") from e
+    except (urllib.error.URLError, OSError) as e:
+        raise ServerUnavailable(str(e)) from e
+    return payload["result"]
+
+
+# ============ API (server first, in-process fallback) ============
+def search(query, domain=None, max_results=3):
+    """core.search via the server when available."""
+    try:
+        return call("search", query=query, domain=domain, max_results=max_results)
+    except ServerUnavailable:
+        from core import search as local_search
+        return local_search(query, domain, max_results)
+
+
+def search_stack(query, stack, max_results=3):
+    """core.search_stack via the server when available."""
+    try:
+        return call("search_stack", query=query, stack=stack, max_results=max_results)
+    except ServerUnavailable:
+        from core import search_stack as local_search_stack
+        return local_search_stack(query, stack, max_results)
+
+
+def search_domains(query, domains=None):
+    """core.search_domains via the server when available."""
+    try:
+        return call("search_domains", query=query, domains=domains)
+    except ServerUnavailable:
+        from core import search_domains as local_search_domains
+        return local_search_domains(query, domains)
+
+
+def search_many(queries, domain=None, stack=None, max_results=3):
+    """core.search_many via the server when available."""
+    try:
+        return call("search_many", queries=queries, domain=domain, stack=stack, max_results=max_results)
+    except ServerUnavailable:
+        from core import search_many as local_search_many
+        return local_search_many(queries, domain, stack, max_results)
+
+
+def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii",
+                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+    """design_system.generate_design_system via the server when available."""
+    if persist and not output_dir:
+        # Persisted files belong to the caller's working directory, not the server's
+        output_dir = os.getcwd()
+    try:
+        return call("generate_design_system", query=query, project_name=project_name,
+                    output_format=output_format, persist=persist, page=page, output_dir=output_dir)
+    except ServerUnavailable:
+        from design_system import generate_design_system as local_generate
+        return local_generate(query, project_name, output_format, persist=persist, page=page, output_dir=output_dir)
+
+
+def generate_many(queries):
+    """design_system.generate_many via the server when available."""
+    try:
+        return call("generate_many", queries=queries)
+    except ServerUnavailable:
+        from design_system import generate_many as local_generate_many
+        return local_generate_many(queries)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="UI Pro Max Search Client")
+    parser.add_argument("query", help="Search query")
+    parser.add_argument("--domain", "-d", type=str, default=None, help="Search domain")
+    parser.add_argument("--stack", "-s", type=str, default=None, help="Stack-specific search")
+    parser.add_argument("--max-results", "-n", type=int, default=3, help="Max results (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
+    parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
+    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
+
+    args = parser.parse_args()
+
+    if args.design_system:
+        print(generate_design_system(args.query, args.project_name, args.format))
+    else:
+        if args.stack:
+            result = search_stack(args.query, args.stack, args.max_results)
+        else:
+            result = search(args.query, args.domain, args.max_results)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            from search import format_output
+            print(format_output(result))
@@ -2,17 +2,40 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
+
+Modules only needed to (re)build an index or run a process pool (csv,
+hashlib, concurrent.futures, numpy) are imported on demand, so a search
+against prebuilt indexes starts fast; see bench_startup.py.
 """
 
-import csv
+import heapq
+import json
+import os
 import re
+import sys
+import threading
+import time
+import zlib
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".index"  # Prebuilt BM25 indexes, one per data file
+INDEX_VERSION = 2
 MAX_RESULTS = 3
+INDEX_CACHE_SIZE = 64  # Fitted indexes kept in memory per process
+RESULT_CACHE_SIZE = 512  # Recent (file, query, max_results) results kept in memory
+BATCH_PARALLEL_MIN = 64  # Smallest batch worth spreading across a process pool
+
+# BM25 scoring backend: "python", "numpy" (sparse matrix, needs NumPy) or
+# "auto" (NumPy for corpora of NUMPY_MIN_DOCS+ documents when installed)
+BM25_BACKEND = os.environ.get("UI_PRO_MAX_BM25_BACKEND", "auto")
+NUMPY_MIN_DOCS = 5000
+NUMPY_BATCH_CELLS = 1 << 22  # Max query x document scores held at once by score_many
 
 CSV_CONFIG = {
     "style": {
@@ -96,15 +119,172 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ INSTRUMENTATION ============
+# Opt-in profiling. A hook is called as hook("time", stage, seconds) when a
+# stage() block ends and hook("count", counter, n) for count(); with no hook
+# installed, stage() returns a shared no-op context and count() returns at once.
+_profile_hook = None
+_NO_STAGE = nullcontext()
+
+
+class _Stage:
+    """Times one stage() block and reports it to the profile hook"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        hook = _profile_hook
+        if hook is not None:
+            hook("time", self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name):
+    """Context manager timing a block as `name` (no-op unless profiling)"""
+    return _NO_STAGE if _profile_hook is None else _Stage(name)
+
+
+def count(name, n=1):
+    """Add n to counter `name` (no-op unless profiling)"""
+    if _profile_hook is not None:
+        _profile_hook("count", name, n)
+
+
+def set_profile_hook(hook):
+    """Install hook(event, name, value) for stage timings and counters; None disables.
+
+    Returns the previously installed hook.
+    """
+    global _profile_hook
+    previous, _profile_hook = _profile_hook, hook
+    return previous
+
+
+class Profile:
+    """Profile hook that aggregates stage timings (calls, total seconds) and counters.
+
+    Stages nest: an outer stage's time includes the stages run inside it.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = defaultdict(lambda: [0, 0.0])
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __call__(self, event, name, value):
+        with self._lock:
+            if event == "time":
+                timing = self.timings[name]
+                timing[0] += 1
+                timing[1] += value
+            else:
+                self.counters[name] += value
+
+    def report(self):
+        """JSON-safe summary: total_ms, stages {name: {calls, ms}}, counters"""
+        return {
+            "total_ms": (time.perf_counter() - self.started) * 1000,
+            "stages": {name: {"calls": calls, "ms": seconds * 1000} for name, (calls, seconds) in self.timings.items()},
+            "counters": dict(self.counters)
+        }
+
+    def format(self):
+        """Token-optimized table, slowest stages first"""
+        report = self.report()
+        lines = [f"## Profile ({report['total_ms']:.2f} ms total)", f"{'stage':<24} {'calls':>6} {'ms':>10}"]
+        for name, timing in sorted(report["stages"].items(), key=lambda x: -x[1]["ms"]):
+            lines.append(f"{name:<24} {timing['calls']:>6} {timing['ms']:>10.3f}")
+        if report["counters"]:
+            lines.append(f"{'counter':<24} {'value':>17}")
+            for name, value in sorted(report["counters"].items()):
+                lines.append(f"{name:<24} {value:>17}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(hook=None):
+    """Profile the enclosed block: `with profile() as prof: ...; print(prof.format())`"""
+    hook = hook or Profile()
+    previous = set_profile_hook(hook)
+    try:
+        yield hook
+    finally:
+        set_profile_hook(previous)
+
+
+# ============ TOKENIZER ============
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+class Tokenizer:
+    """Lowercase, split, remove punctuation, filter short words.
+
+    Optional normalization runs after the length filter: stopwords (words
+    to drop) and stemmer (callable word -> stem). Tokens are interned so
+    every index shares one string per term, and query strings are cached
+    in an LRU. The defaults reproduce the original BM25 tokenization.
+    """
+
+    def __init__(self, min_length=3, stopwords=None, stemmer=None, cache_size=1024):
+        self.min_length = min_length
+        self.stopwords = frozenset(stopwords or ())
+        self.stemmer = stemmer
+        self._tokenize_cached = lru_cache(maxsize=cache_size)(self._tokenize)
+
+    def _tokenize(self, text):
+        text = _PUNCTUATION_RE.sub(' ', text.lower())
+        words = [w for w in text.split() if len(w) >= self.min_length]
+        if self.stopwords:
+            words = [w for w in words if w not in self.stopwords]
+        if self.stemmer is not None:
+            words = [self.stemmer(w) for w in words]
+        return tuple(sys.intern(w) for w in words)
+
+    def tokenize(self, text):
+        """Tokenize a document (uncached: documents are seen once per fit)"""
+        return list(self._tokenize(str(text)))
+
+    def tokenize_query(self, text):
+        """Tokenize a query string through the LRU cache"""
+        return list(self._tokenize_cached(str(text)))
+
+
+DEFAULT_TOKENIZER = Tokenizer()
+
+
 # ============ BM25 IMPLEMENTATION ============
+def _import_numpy():
+    """NumPy if installed, else None (the NumPy backend is optional)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, backend=None, tokenizer=None):
         self.k1 = k1
         self.b = b
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self.backend = backend or BM25_BACKEND
+        if self.backend not in ("auto", "python", "numpy"):
+            raise ValueError(f"Unknown BM25 backend: {self.backend}. Available: auto, python, numpy")
+        self._matrix = None  # Lazily built NumPy term-document matrix (False: use Python)
         self.corpus = []
         self.doc_lengths = []
+        self.doc_norms = []
+        self.postings = {}
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
@@ -112,83 +292,499 @@ class BM25:
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return self.tokenizer.tokenize(text)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
+        with stage("bm25.tokenize"):
+            self.corpus = [self.tokenize(doc) for doc in documents]
         self.N = len(self.corpus)
         if self.N == 0:
             return
+        with stage("bm25.fit"):
+            self._fit_corpus()
+
+    def _fit_corpus(self):
+        """Postings, IDF and length norms for the tokenized corpus"""
         self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
+        # Inverted index: term -> [(doc_id, tf), ...] in doc_id order
+        postings = defaultdict(list)
         for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
             term_freqs = defaultdict(int)
             for word in doc:
                 term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self.postings = dict(postings)
+        self._matrix = None
+
+        for word, doc_postings in self.postings.items():
+            freq = len(doc_postings)
+            self.doc_freqs[word] = freq
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        self._compute_norms()
+
+    def _compute_norms(self):
+        """Precompute the per-document length normalization of the BM25 denominator"""
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+
+    def to_dict(self):
+        """Export fitted state (postings, document lengths, IDF) as JSON-safe dict"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Restore a fitted BM25 from to_dict() output without re-tokenizing"""
+        bm25 = cls(state["k1"], state["b"])
+        bm25.N = state["N"]
+        bm25.avgdl = state["avgdl"]
+        bm25.doc_lengths = state["doc_lengths"]
+        bm25.idf = state["idf"]
+        bm25.postings = state["postings"]
+        bm25._matrix = None
+        for word, doc_postings in bm25.postings.items():
+            bm25.doc_freqs[word] = len(doc_postings)
+        if bm25.N:
+            bm25._compute_norms()
+        return bm25
+
+    def score(self, query, top_k=None):
+        """Score documents sharing a term with query, best first.
+
+        Only documents in the query terms' postings are touched; documents
+        without a matching term (score 0) are omitted. With top_k, only the
+        best top_k are selected, using a heap instead of a full sort.
+        """
+        with stage("query.tokenize"):
+            query_tokens = self.tokenizer.tokenize_query(query)
+        return self.score_tokens(query_tokens, top_k)
+
+    def score_tokens(self, query_tokens, top_k=None):
+        """score() for an already tokenized query (lets callers tokenize once)"""
+        with stage("bm25.score"):
+            if self._use_numpy():
+                return self._score_numpy([query_tokens], top_k)[0]
+            return self._score_python(query_tokens, top_k)
+
+    def score_many(self, queries, top_k=None):
+        """Score a batch of queries; returns one score() ranking per query"""
+        with stage("query.tokenize"):
+            token_lists = [self.tokenizer.tokenize_query(query) for query in queries]
+        with stage("bm25.score"):
+            if self._use_numpy():
+                return self._score_numpy(token_lists, top_k)
+            return [self._score_python(query_tokens, top_k) for query_tokens in token_lists]
+
+    def _score_python(self, query_tokens, top_k):
+        """Pure-Python scoring over the inverted index"""
+        scores = defaultdict(float)
+        numerator_factor = self.k1 + 1
+        postings_touched = 0
+
+        for token in query_tokens:
+            if token in self.idf:
+                idf = self.idf[token]
+                doc_postings = self.postings[token]
+                postings_touched += len(doc_postings)
+                for idx, tf in doc_postings:
+                    scores[idx] += idf * (tf * numerator_factor) / (tf + self.doc_norms[idx])
+
+        count("bm25.postings_touched", postings_touched)
+        count("bm25.docs_scored", len(scores))
+
+        # Ties keep document order, like a stable sort on score
+        if top_k is None:
+            return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return heapq.nlargest(top_k, scores.items(), key=lambda x: (x[1], -x[0]))
+
+    # ---- NumPy backend ----
+    def _use_numpy(self):
+        """Decide (once per fit) whether scoring goes through the NumPy matrix"""
+        if self._matrix is None:
+            wanted = self.backend == "numpy" or (self.backend == "auto" and self.N >= NUMPY_MIN_DOCS)
+            np = _import_numpy() if wanted and self.N else None
+            self._matrix = self._build_matrix(np) if np is not None else False
+        return self._matrix is not False
+
+    def _build_matrix(self, np):
+        """CSR term-document matrix (rows = terms) holding precomputed BM25 weights"""
+        term_ids = {}
+        indptr = [0]
+        doc_ids = []
+        tfs = []
+        idfs = []
+        for term, doc_postings in self.postings.items():
+            term_ids[term] = len(term_ids)
+            for idx, tf in doc_postings:
+                doc_ids.append(idx)
+                tfs.append(tf)
+            idfs.extend([self.idf[term]] * len(doc_postings))
+            indptr.append(len(doc_ids))
+
+        indices = np.array(doc_ids, dtype=np.int64)
+        tf = np.array(tfs, dtype=np.float64)
+        norms = np.array(self.doc_norms, dtype=np.float64)
+        # Same operation order as _score_python, so weights are bit-identical
+        weights = np.array(idfs, dtype=np.float64) * (tf * (self.k1 + 1)) / (tf + norms[indices])
+        return {"np": np, "term_ids": term_ids, "indptr": np.array(indptr, dtype=np.int64),
+                "indices": indices, "weights": weights}
+
+    def _score_numpy(self, token_lists, top_k):
+        """Score queries with one sparse product per chunk of queries"""
+        matrix = self._matrix
+        np = matrix["np"]
+        term_ids, indptr = matrix["term_ids"], matrix["indptr"]
+        chunk_size = max(1, NUMPY_BATCH_CELLS // max(self.N, 1))
+
+        rankings = []
+        for start in range(0, len(token_lists), chunk_size):
+            chunk = token_lists[start:start + chunk_size]
+            # Gather the postings of every query term (repeats included, in
+            # query order) and offset doc ids by query row: bincount then sums
+            # each document's weights in the same order as the Python loop.
+            slices, offsets = [], []
+            for row, query_tokens in enumerate(chunk):
+                for token in query_tokens:
+                    term_id = term_ids.get(token)
+                    if term_id is not None:
+                        slices.append(np.arange(indptr[term_id], indptr[term_id + 1]))
+                        offsets.append(np.full(len(slices[-1]), row * self.N, dtype=np.int64))
+            if slices:
+                positions = np.concatenate(slices)
+                count("bm25.postings_touched", len(positions))
+                bins = matrix["indices"][positions] + np.concatenate(offsets)
+                scores = np.bincount(bins, weights=matrix["weights"][positions], minlength=len(chunk) * self.N)
+            else:
+                scores = np.zeros(len(chunk) * self.N)
+            for row_scores in scores.reshape(len(chunk), self.N):
+                rankings.append(self._rank_numpy(np, row_scores, top_k))
+        return rankings
+
+    def _rank_numpy(self, np, scores, top_k):
+        """Top-k (doc_id, score) pairs from a dense score vector, ties by doc order"""
+        if top_k is not None and top_k <= 0:
+            return []
+        candidates = np.flatnonzero(scores)
+        values = scores[candidates]
+        if top_k is not None and top_k < len(candidates):
+            kth = np.partition(values, len(values) - top_k)[len(values) - top_k]
+            keep = values >= kth
+            candidates, values = candidates[keep], values[keep]
+        order = np.lexsort((candidates, -values))[:top_k]
+        return [(int(candidates[i]), float(values[i])) for i in order]
+
+
+# ============ COLUMNAR TABLE ============
+def _intern(value):
+    """Intern CSV strings so repeated cell values share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Table:
+    """Compact column store for CSV data: one list of interned strings per column.
+
+    Rows are exposed as lightweight Row views; dicts are only built for the
+    rows a caller actually returns (see Row.to_dict).
+    """
+
+    __slots__ = ("columns", "data", "size", "_positions")
+
+    def __init__(self, columns, data, size):
+        self.columns = list(columns)
+        self.data = [[_intern(value) for value in values] for values in data]
+        self.size = size
+        self._positions = {col: pos for pos, col in enumerate(self.columns)}
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        if not -self.size <= idx < self.size:
+            raise IndexError("Table row index out of range")
+        return Row(self, idx % self.size)
+
+    def __iter__(self):
+        return (Row(self, idx) for idx in range(self.size))
+
+    def column(self, name):
+        """All values of one column"""
+        return self.data[self._positions[name]]
+
+    def select(self, columns):
+        """Project onto the given columns (those present), sharing column lists"""
+        table = Table.__new__(Table)
+        table.columns = [col for col in columns if col in self._positions]
+        table.data = [self.column(col) for col in table.columns]
+        table.size = self.size
+        table._positions = {col: pos for pos, col in enumerate(table.columns)}
+        return table
+
+    def to_dict(self):
+        """JSON-safe form for the on-disk index"""
+        return {"columns": self.columns, "data": self.data, "size": self.size}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state["columns"], state["data"], state["size"])
+
+
+class Row:
+    """Read-only view of one Table row"""
+
+    __slots__ = ("table", "idx")
+
+    def __init__(self, table, idx):
+        self.table = table
+        self.idx = idx
+
+    def get(self, col, default=None):
+        pos = self.table._positions.get(col)
+        return default if pos is None else self.table.data[pos][self.idx]
+
+    def __getitem__(self, col):
+        pos = self.table._positions.get(col)
+        if pos is None:
+            raise KeyError(col)
+        return self.table.data[pos][self.idx]
+
+    def __contains__(self, col):
+        return col in self.table._positions
+
+    def to_dict(self, columns=None):
+        """Materialize the row as a dict of the given columns (default: all)"""
+        if columns is None:
+            columns = self.table.columns
+        return {col: self[col] for col in columns if col in self}
+
+
+def _load_table(filepath, columns=None):
+    """Load CSV into a Table, keeping only the given columns (default: all).
+
+    Mirrors csv.DictReader: blank lines are skipped, missing trailing
+    fields are None and a repeated header name keeps its last column.
+    """
+    import csv
+    with stage("csv.parse"), open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = {col: pos for pos, col in enumerate(header)}
+        wanted = [col for col in (header if columns is None else columns) if col in positions]
+        wanted = list(dict.fromkeys(wanted))
+        data = [[] for _ in wanted]
+        size = 0
+        for row in reader:
+            if not row:
+                continue
+            for values, col in zip(data, wanted):
+                pos = positions[col]
+                values.append(row[pos] if pos < len(row) else None)
+            size += 1
+    count("csv.rows", size)
+    return Table(wanted, data, size)
+
+
+# ============ PERSISTENT INDEX ============
+def _file_signature(filepath):
+    """Cheap change check: (mtime_ns, size) of a data file"""
+    stat = filepath.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_hash(filepath):
+    """Content hash of a data file, used when only its mtime changed"""
+    import hashlib
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _index_path(filepath, search_cols, output_cols):
+    """Index file for a data file + column layout, e.g. stacks__react.1a2b3c4d.json"""
+    try:
+        name = filepath.resolve().relative_to(DATA_DIR.resolve()).as_posix()
+    except ValueError:
+        name = filepath.name
+    cols_key = f"{zlib.crc32(json.dumps([search_cols, output_cols]).encode('utf-8')):08x}"
+    return INDEX_DIR / f"{name.replace('/', '__')}.{cols_key}.json"
+
+
+def _build_index(filepath, search_cols, output_cols):
+    """Tokenize a CSV once and return its serializable index"""
+    count("index.builds")
+    table = _load_table(filepath, list(search_cols) + list(output_cols))
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    # Build documents from search columns
+    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in table]
+    bm25 = BM25()
+    bm25.fit(documents)
 
-            scores.append((idx, score))
+    mtime_ns, size = _file_signature(filepath)
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    return {
+        "version": INDEX_VERSION,
+        "source": {"mtime_ns": mtime_ns, "size": size, "sha256": _file_hash(filepath)},
+        "search_cols": search_cols,
+        "output_cols": output_cols,
+        # Store only the output columns present in this file
+        "table": table.select(output_cols).to_dict(),
+        "bm25": bm25.to_dict()
+    }
 
 
-# ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+def _read_index(path):
+    """Read an index file, or None if missing/corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(path, index):
+    """Atomically write an index file; silently skip read-only installs"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with stage("index.write"), open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _load_index(filepath, search_cols, output_cols):
+    """Load the prebuilt index for a data file, rebuilding it when the CSV changed"""
+    path = _index_path(filepath, search_cols, output_cols)
+    with stage("index.read"):
+        index = _read_index(path)
+
+    valid = (
+        isinstance(index, dict)
+        and index.get("version") == INDEX_VERSION
+        and index.get("search_cols") == search_cols
+        and index.get("output_cols") == output_cols
+    )
+    if valid:
+        source = index["source"]
+        mtime_ns, size = _file_signature(filepath)
+        if (source["mtime_ns"], source["size"]) != (mtime_ns, size):
+            if source["size"] == size and source["sha256"] == _file_hash(filepath):
+                # Touched but unchanged: refresh the signature, keep the index
+                source["mtime_ns"] = mtime_ns
+                _write_index(path, index)
+            else:
+                valid = False
+
+    if not valid:
+        index = _build_index(filepath, search_cols, output_cols)
+        _write_index(path, index)
+
+    with stage("index.restore"):
+        index["table"] = Table.from_dict(index["table"])
+        index["bm25"] = BM25.from_dict(index["bm25"])
+    return index
+
+
+# ============ IN-PROCESS CACHE ============
+# Both caches are LRUs whose entries remember the data file signature they
+# were built from; an entry is dropped as soon as its file changes on disk.
+_cache_lock = threading.Lock()
+_index_cache = OrderedDict()  # (file, search_cols, output_cols) -> (signature, index)
+_result_cache = OrderedDict()  # (file, search_cols, output_cols, query, max_results) -> (signature, results)
+
+
+def _cache_get(cache, key, signature):
+    """Return a cached value if it was built from the current file signature"""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] != signature:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(cache, key, signature, value, max_size):
+    """Insert a value, evicting least recently used entries beyond max_size"""
+    with _cache_lock:
+        cache[key] = (signature, value)
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def clear_cache():
+    """Drop all in-memory indexes and cached results"""
+    with _cache_lock:
+        _index_cache.clear()
+        _result_cache.clear()
+
+
+def _get_index(filepath, search_cols, output_cols, signature):
+    """Fitted index for a data file, loaded from disk at most once per change"""
+    key = (str(filepath), tuple(search_cols), tuple(output_cols))
+    index = _cache_get(_index_cache, key, signature)
+    count("cache.index_hits" if index is not None else "cache.index_misses")
+    if index is None:
+        index = _load_index(filepath, search_cols, output_cols)
+        _cache_put(_index_cache, key, signature, index, INDEX_CACHE_SIZE)
+    return index
+
+
+def preload():
+    """Load every domain and stack index into memory (used by long-running servers)"""
+    configs = [(config["file"], config["search_cols"], config["output_cols"]) for config in CSV_CONFIG.values()]
+    configs += [(config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]) for config in STACK_CONFIG.values()]
+    for file, search_cols, output_cols in configs:
+        filepath = DATA_DIR / file
+        if filepath.exists():
+            _get_index(filepath, search_cols, output_cols, _file_signature(filepath))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
+# ============ SEARCH FUNCTIONS ============
+def _search_csv(filepath, search_cols, output_cols, query, max_results, query_tokens=None):
+    """Core search function using BM25 (query_tokens: query already tokenized)"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
+    signature = _file_signature(filepath)
+    key = (str(filepath), tuple(search_cols), tuple(output_cols), query, max_results)
+    results = _cache_get(_result_cache, key, signature)
+    count("cache.result_hits" if results is not None else "cache.result_misses")
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    if results is None:
+        index = _get_index(filepath, search_cols, output_cols, signature)
+        bm25 = index["bm25"]
+        if query_tokens is None:
+            ranked = bm25.score(query, max_results)
+        else:
+            ranked = bm25.score_tokens(query_tokens, max_results)
+        table = index["table"]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+        # Get top results with score > 0; only these rows become dicts
+        results = []
+        with stage("rows.materialize"):
+            for idx, score in ranked:
+                if score > 0:
+                    results.append(table[idx].to_dict())
+        _cache_put(_result_cache, key, signature, results, RESULT_CACHE_SIZE)
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    # Callers own their copies; cached rows stay untouched
+    return [dict(row) for row in results]
 
 
 def detect_domain(query):
@@ -236,6 +832,37 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
+def search_domains(query, domains=None):
+    """Search several domains in one pass, tokenizing the query once.
+
+    domains maps domain -> max_results (default: every domain, MAX_RESULTS each).
+    Returns {domain: result} with the same result dicts as search().
+    """
+    if domains is None:
+        domains = dict.fromkeys(CSV_CONFIG, MAX_RESULTS)
+
+    with stage("query.tokenize"):
+        query_tokens = DEFAULT_TOKENIZER.tokenize_query(query)
+    results = {}
+    for domain, max_results in domains.items():
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+
+        if not filepath.exists():
+            results[domain] = {"error": f"File not found: {filepath}", "domain": domain}
+            continue
+
+        rows = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, query_tokens)
+        results[domain] = {
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(rows),
+            "results": rows
+        }
+    return results
+
+
 def search_stack(query, stack, max_results=MAX_RESULTS):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
@@ -256,3 +883,52 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+# ============ BATCH SEARCH ============
+def _search_one(item, domain=None, stack=None, max_results=MAX_RESULTS):
+    """Run one batch entry: a query string or {"query", "domain"/"stack", "max_results", "id"} dict"""
+    query = item
+    if isinstance(item, dict):
+        query = item.get("query")
+        if "domain" in item or "stack" in item:
+            domain, stack = item.get("domain"), item.get("stack")
+        max_results = item.get("max_results", max_results)
+
+    if not isinstance(query, str):
+        result = {"error": item.get("error", "Missing query") if isinstance(item, dict) else "Missing query"}
+    elif stack:
+        result = search_stack(query, stack, max_results)
+    else:
+        result = search(query, domain, max_results)
+
+    # Echo caller-supplied ids so streamed results can be matched up
+    if isinstance(item, dict) and "id" in item:
+        result = {"id": item["id"], **result}
+    return result
+
+
+def iter_search_many(queries, domain=None, stack=None, max_results=MAX_RESULTS, workers=None):
+    """Yield one result per query, in input order, sharing indexes across the batch.
+
+    With workers > 1, batches of at least BATCH_PARALLEL_MIN queries are
+    spread across a process pool; each worker loads the prebuilt indexes once.
+    """
+    run = partial(_search_one, domain=domain, stack=stack, max_results=max_results)
+
+    if workers and workers > 1:
+        queries = list(queries)
+        if len(queries) >= BATCH_PARALLEL_MIN:
+            from concurrent.futures import ProcessPoolExecutor
+            chunksize = max(1, len(queries) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(run, queries, chunksize=chunksize)
+            return
+
+    for item in queries:
+        yield run(item)
+
+
+def search_many(queries, domain=None, stack=None, max_results=MAX_RESULTS, workers=None):
+    """Batch search: one result dict per query string or query dict"""
+    return list(iter_search_many(queries, domain, stack, max_results, workers))
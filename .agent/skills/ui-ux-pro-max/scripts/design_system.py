@@ -11,18 +11,32 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True,
+                                    page=["dashboard", {"page": "checkout", "query": "checkout payment form"}])
+
+    # Many projects in one process (reasoning and indexes loaded once)
+    from design_system import generate_many
+    results = generate_many(["SaaS dashboard", {"query": "beauty spa", "project_name": "Serenity", "id": 1}])
 """
 
+import copy
 import csv
 import json
 import os
+import re
+import sys
+import threading
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_domains, stage, preload, DATA_DIR
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
+# Threads rendering page overrides: searches are pure Python, so threads only
+# pay off on free-threaded builds; elsewhere pages render sequentially
+PAGE_WORKERS = 1 if getattr(sys, "_is_gil_enabled", lambda: True)() else min(8, os.cpu_count() or 1)
 
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
@@ -33,63 +47,104 @@ SEARCH_CONFIG = {
 }
 
 
-# ============ DESIGN SYSTEM GENERATOR ============
-class DesignSystemGenerator:
-    """Generates design system recommendations from aggregated searches."""
-
-    def __init__(self):
-        self.reasoning_data = self._load_reasoning()
-
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+# ============ REASONING INDEX ============
+class ReasoningIndex:
+    """Reasoning rules with lookups precomputed at load time.
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
-        for domain, config in SEARCH_CONFIG.items():
-            if domain == "style" and style_priority:
-                # For style, also search with priority keywords
-                priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
-            else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+    exact: lowercased UI_Category -> first matching rule position
+    keywords: UI_Category keyword -> rule positions (inverted index)
+    decision_rules / style_priority: parsed once per rule
+    """
 
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.categories = [rule.get("UI_Category", "").lower() for rule in rules]
+        self.exact = {}
+        self.keywords = defaultdict(list)
+        for pos, ui_cat in enumerate(self.categories):
+            self.exact.setdefault(ui_cat, pos)
+            for kw in dict.fromkeys(ui_cat.replace("/", " ").replace("-", " ").split()):
+                self.keywords[kw].append(pos)
+
+        self.decision_rules = []
+        for rule in rules:
+            try:
+                self.decision_rules.append(json.loads(rule.get("Decision_Rules") or "{}"))
+            except json.JSONDecodeError:
+                self.decision_rules.append({})
+        self.style_priority = [[s.strip() for s in rule.get("Style_Priority", "").split("+")] for rule in rules]
+        self._matches = {}
+
+    def find(self, category: str):
+        """Position of the rule matching category (exact, partial, keyword), or None."""
         category_lower = category.lower()
+        if category_lower in self._matches:
+            return self._matches[category_lower]
 
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
+        pos = self.exact.get(category_lower)
 
         # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
+        if pos is None:
+            pos = next((p for p, ui_cat in enumerate(self.categories)
+                        if ui_cat in category_lower or category_lower in ui_cat), None)
+
+        # Try keyword match: earliest rule owning a keyword found in the category
+        if pos is None:
+            matches = [positions[0] for kw, positions in self.keywords.items() if kw in category_lower]
+            pos = min(matches) if matches else None
+
+        self._matches[category_lower] = pos
+        return pos
+
 
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+_reasoning_lock = threading.Lock()
+_reasoning_cache = {}  # filepath -> ((mtime_ns, size), ReasoningIndex)
 
-        return {}
+
+def load_reasoning_index() -> ReasoningIndex:
+    """Shared ReasoningIndex for REASONING_FILE, reloaded only when the file changes."""
+    filepath = DATA_DIR / REASONING_FILE
+    if not filepath.exists():
+        return ReasoningIndex([])
+    stat = filepath.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _reasoning_lock:
+        cached = _reasoning_cache.get(filepath)
+        if cached is None or cached[0] != signature:
+            with stage("reasoning.load"), open(filepath, 'r', encoding='utf-8') as f:
+                cached = (signature, ReasoningIndex(list(csv.DictReader(f))))
+            _reasoning_cache[filepath] = cached
+        return cached[1]
+
+
+# ============ DESIGN SYSTEM GENERATOR ============
+class DesignSystemGenerator:
+    """Generates design system recommendations from aggregated searches."""
+
+    def __init__(self):
+        self.reasoning = load_reasoning_index()
+
+    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
+        """Execute searches across multiple domains (query tokenized once)."""
+        domains = {domain: config["max_results"] for domain, config in SEARCH_CONFIG.items()}
+        if not style_priority:
+            return search_domains(query, domains)
+
+        # For style, also search with priority keywords
+        style_max = domains.pop("style")
+        results = search_domains(query, domains)
+        priority_query = " ".join(style_priority[:2])
+        results["style"] = search(f"{query} {priority_query}", "style", style_max)
+        return {domain: results[domain] for domain in SEARCH_CONFIG}
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        with stage("reasoning.lookup"):
+            pos = self.reasoning.find(category)
 
-        if not rule:
+        if pos is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -101,16 +156,13 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
+        # Decision rules JSON and style priority are parsed once at load time
+        rule = self.reasoning.rules[pos]
+        decision_rules = copy.copy(self.reasoning.decision_rules[pos])
 
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
-            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
+            "style_priority": list(self.reasoning.style_priority[pos]),
             "color_mood": rule.get("Color_Mood", ""),
             "typography_mood": rule.get("Typography_Mood", ""),
             "key_effects": rule.get("Key_Effects", ""),
@@ -163,7 +215,8 @@ class DesignSystemGenerator:
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        with stage("generate.search"):
+            product_result = search(query, "product", 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -174,7 +227,8 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        with stage("generate.search"):
+            search_results = self._multi_domain_search(query, style_priority)
         search_results["product"] = product_result  # Reuse product search
 
         # Step 4: Select best matches from each domain using priority
@@ -235,6 +289,55 @@ class DesignSystemGenerator:
             "severity": reasoning.get("severity", "MEDIUM")
         }
 
+    def generate_many(self, queries) -> list:
+        """Generate one design system per query string or {"query", "project_name", "id"} dict."""
+        results = []
+        for item in queries:
+            query, project_name = item, None
+            if isinstance(item, dict):
+                query, project_name = item.get("query"), item.get("project_name")
+
+            if not isinstance(query, str):
+                result = {"error": "Missing query"}
+            else:
+                result = self.generate(query, project_name)
+
+            # Echo caller-supplied ids so results can be matched up
+            if isinstance(item, dict) and "id" in item:
+                result = {"id": item["id"], **result}
+            results.append(result)
+        return results
+
+
+# ============ SHARED GENERATOR ============
+_generator_lock = threading.Lock()
+_generator = None
+_preloaded = False
+
+
+def get_generator(preload_indexes: bool = False) -> DesignSystemGenerator:
+    """Process-wide generator sharing reasoning rules and cached domain indexes.
+
+    The generator holds no per-call state, so it is safe to share across
+    threads; it is rebuilt when ui-reasoning.csv changes. preload_indexes
+    loads every domain index up front (batches and servers), instead of on
+    first use (one-off CLI calls).
+    """
+    global _generator, _preloaded
+    with _generator_lock:
+        if preload_indexes and not _preloaded:
+            with stage("generate.preload"):
+                preload()
+            _preloaded = True
+        if _generator is None or _generator.reasoning is not load_reasoning_index():
+            _generator = DesignSystemGenerator()
+        return _generator
+
+
+def generate_many(queries) -> list:
+    """Generate design systems for many queries, sharing setup across the batch."""
+    return get_generator(preload_indexes=True).generate_many(queries)
+
 
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
@@ -459,7 +562,7 @@ def format_markdown(design_system: dict) -> str:
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page=None, output_dir: str = None, workers: int = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -468,48 +571,141 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         project_name: Optional project name for output header
         output_format: "ascii" (default) or "markdown"
         persist: If True, save design system to design-system/ folder
-        page: Optional page name for page-specific override file
+        page: Optional page name for page-specific override file, or a list of pages
         output_dir: Optional output directory (defaults to current working directory)
+        workers: Threads rendering page overrides (default: PAGE_WORKERS)
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
+    with stage("generate.load_reasoning"):
+        generator = get_generator()
     design_system = generator.generate(query, project_name)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        with stage("persist"):
+            persist_design_system(design_system, page, output_dir, query, workers)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    with stage(f"format.{output_format}"):
+        if output_format == "markdown":
+            return format_markdown(design_system)
+        return format_ascii_box(design_system)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+# "Generated" timestamp lines are ignored when deciding whether a file changed
+_GENERATED_RE = re.compile(r"^(?:> )?\*\*Generated:\*\* .*$", re.MULTILINE)
+
+
+def _write_if_changed(path: Path, content: str, incremental: bool = True) -> bool:
+    """Atomically write content unless the file only differs in its timestamp; True if written."""
+    if incremental:
+        try:
+            existing = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            existing = None
+        if existing is not None and _GENERATED_RE.sub("", existing) == _GENERATED_RE.sub("", content):
+            return False
+
+    # Temp file + rename: watchers never see a half-written file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def load_pages_manifest(path) -> list:
+    """
+    Read a pages manifest for persist_design_system.
+
+    .json files hold a list (or {"pages": [...]}) of page names or
+    {"page": "checkout", "query": "checkout payment form"} dicts; any other
+    file lists one page name per line (blank lines and # comments ignored).
+    """
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+        return data.get("pages", []) if isinstance(data, dict) else data
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def _slug(name: str, default: str) -> str:
+    """File or folder name for a project or page: lowercase (Unicode) word characters and '-'.
+
+    Path separators, dots and other punctuation become '-', so a slug is never
+    '.', '..' or a path.
+    """
+    return re.sub(r"[^\w-]+", "-", str(name).lower()).strip("-") or default
+
+
+def _page_slug(page: str) -> str:
+    """File name stem for a page override."""
+    return _slug(page, "page")
+
+
+def _normalize_pages(page, page_query: str = None) -> list:
+    """(name, query) pairs from a page name, a {"page", "query"} dict or a list of either.
+
+    Repeated names keep their first entry; different names that would share a
+    file raise ValueError.
+    """
+    if not page:
+        return []
+    items = [page] if isinstance(page, (str, dict)) else page
+
+    pages = {}
+    for item in items:
+        name, query = item, page_query
+        if isinstance(item, dict):
+            name, query = item.get("page"), item.get("query") or page_query
+        if not name:
+            continue
+        slug = _page_slug(name)
+        if slug not in pages:
+            pages[slug] = (name, query)
+        elif pages[slug][0] != name:
+            raise ValueError(f"Pages {pages[slug][0]!r} and {name!r} would both be written to pages/{slug}.md")
+    return list(pages.values())
+
+
+def persist_design_system(design_system: dict, page=None, output_dir: str = None, page_query: str = None,
+                          workers: int = None, incremental: bool = True) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
     Args:
         design_system: The generated design system dictionary
-        page: Optional page name for page-specific override file
+        page: Optional page name for page-specific override file, or a list of
+              page names / {"page", "query"} dicts (see load_pages_manifest)
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        workers: Threads rendering page overrides (default: PAGE_WORKERS)
+        incremental: Leave files untouched when only their timestamp would change
     
     Returns:
-        dict with created file paths and status
+        dict with status, all file paths (created_files), and the files that were
+        actually written (modified_files) or left as they were (unchanged_files)
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
     project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
+    project_slug = _slug(project_name, "default")
     
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
+    if not design_system_dir.resolve().is_relative_to(base_dir.resolve()):
+        raise ValueError(f"Design system folder escapes {base_dir}: {design_system_dir}")
     
     created_files = []
+    modified_files = []
     
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
@@ -517,24 +713,38 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     
     master_file = design_system_dir / "MASTER.md"
     
-    # Generate and write MASTER.md
+    # Generate and write MASTER.md (once, however many pages)
     master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    if _write_if_changed(master_file, master_content, incremental):
+        modified_files.append(str(master_file))
     created_files.append(str(master_file))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+    # Create page override files with intelligent content. Override searches
+    # share the in-process indexes, so pages can be rendered on a thread pool.
+    pages = _normalize_pages(page, page_query)
+    def render(item):
+        return format_page_override_md(design_system, *item)
+
+    workers = min(workers or PAGE_WORKERS, len(pages))
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            page_contents = list(executor.map(render, pages))
+    else:
+        page_contents = [render(item) for item in pages]
+
+    for (name, _), page_content in zip(pages, page_contents):
+        page_file = pages_dir / f"{_page_slug(name)}.md"
+        if _write_if_changed(page_file, page_content, incremental):
+            modified_files.append(str(page_file))
         created_files.append(str(page_file))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "modified_files": modified_files,
+        "unchanged_files": [f for f in created_files if f not in modified_files]
     }
 
 
@@ -917,16 +1127,16 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
     combined_context = f"{page_lower} {query_lower}"
     
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    # Search across multiple domains for page-specific guidance (one pass)
+    with stage("overrides.search"):
+        page_searches = search_domains(combined_context, {"style": 1, "ux": 3, "landing": 1})
+    style_search = page_searches["style"]
+    ux_search = page_searches["ux"]
+    landing_search = page_searches["landing"]
     
     # Extract results from search response
     style_results = style_search.get("results", [])
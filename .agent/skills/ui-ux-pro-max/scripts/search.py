@@ -1,106 +1,190 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
-Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
-       python search.py "<query>" --design-system [-p "Project Name"]
-       python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
-
-Domains: style, prompt, color, chart, landing, product, ux, typography
-Stacks: html-tailwind, react, nextjs
-
-Persistence (Master + Overrides pattern):
-  --persist    Save design system to design-system/MASTER.md
-  --page       Also create a page-specific override file in design-system/pages/
-"""
-
-import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
-
-
-def format_output(result):
-    """Format results for Claude consumption (token-optimized)"""
-    if "error" in result:
-        return f"Error: {result['error']}"
-
-    output = []
-    if result.get("stack"):
-        output.append(f"## UI Pro Max Stack Guidelines")
-        output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
-    else:
-        output.append(f"## UI Pro Max Search Results")
-        output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
-    output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
-
-    for i, row in enumerate(result['results'], 1):
-        output.append(f"### Result {i}")
-        for key, value in row.items():
-            value_str = str(value)
-            if len(value_str) > 300:
-                value_str = value_str[:300] + "..."
-            output.append(f"- **{key}:** {value_str}")
-        output.append("")
-
-    return "\n".join(output)
-
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
-    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
-    parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
-    # Design system generation
-    parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
-    parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
-    # Persistence (Master + Overrides pattern)
-    parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
-    parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
-    parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
-
-    args = parser.parse_args()
-
-    # Design system takes priority
-    if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
-        
-        # Print persistence confirmation
-        if args.persist:
-            project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
-            print("\n" + "=" * 60)
-            print(f"✅ Design system persisted to design-system/{project_slug}/")
-            print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
-                print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
-            print("")
-            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
-            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
-            print("=" * 60)
-    # Stack search
-    elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
-    # Domain search
-    else:
-        result = search(args.query, args.domain, args.max_results)
-        if args.json:
-            import json
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(format_output(result))
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
+Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --design-system [-p "Project Name"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages pages.json [--jobs 8]
+       python search.py --batch [queries.txt|-] [--domain <domain>] [--jobs 4]
+       python search.py --serve [--host 127.0.0.1] [--port 8765]
+
+Domains: style, prompt, color, chart, landing, product, ux, typography
+Stacks: html-tailwind, react, nextjs
+
+Persistence (Master + Overrides pattern):
+  --persist    Save design system to design-system/MASTER.md
+  --page       Also create a page-specific override file in design-system/pages/
+               (repeatable; MASTER.md is written once for all pages)
+  --pages      Pages manifest: one page name per line, or a JSON list of names /
+               {"page": "checkout", "query": "checkout payment form"} objects.
+               Overrides are rendered in parallel (--jobs threads)
+  --force      Rewrite files that are unchanged apart from their timestamp
+               (by default they are left alone, so watchers and git stay quiet)
+
+Batch mode:
+  --batch      Read one query per line (plain text or JSON objects with "query",
+               "domain"/"stack", "max_results", "id") from a file or stdin and
+               stream one JSON result per line (NDJSON)
+
+Profiling:
+  --profile    Print per-stage timings (CSV parsing, tokenization, BM25 fit/score,
+               reasoning lookup, formatting) and counters to stderr
+
+Server mode:
+  --serve      Keep all indexes warm and answer JSON requests over localhost HTTP
+               (see server.py); client.py calls it and falls back to in-process search
+"""
+
+import argparse
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack, iter_search_many
+
+
+def format_output(result):
+    """Format results for Claude consumption (token-optimized)"""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    output = []
+    if result.get("stack"):
+        output.append(f"## UI Pro Max Stack Guidelines")
+        output.append(f"**Stack:** {result['stack']} | **Query:** {result['query']}")
+    else:
+        output.append(f"## UI Pro Max Search Results")
+        output.append(f"**Domain:** {result['domain']} | **Query:** {result['query']}")
+    output.append(f"**Source:** {result['file']} | **Found:** {result['count']} results\n")
+
+    for i, row in enumerate(result['results'], 1):
+        output.append(f"### Result {i}")
+        for key, value in row.items():
+            value_str = str(value)
+            if len(value_str) > 300:
+                value_str = value_str[:300] + "..."
+            output.append(f"- **{key}:** {value_str}")
+        output.append("")
+
+    return "\n".join(output)
+
+
+def read_batch(stream):
+    """Yield batch entries from lines of plain-text queries or JSON objects"""
+    import json
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield {"query": None, "error": f"Invalid JSON: {e}"}
+        else:
+            yield line
+
+
+if __name__ == "__main__":
+    import sys
+    parser = argparse.ArgumentParser(description="UI Pro Max Search")
+    parser.add_argument("query", nargs="?", help="Search query")
+    parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
+    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    # Design system generation
+    parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
+    parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
+    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
+    # Persistence (Master + Overrides pattern)
+    parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
+    parser.add_argument("--page", type=str, action="append", default=None, help="Create page-specific override file in design-system/pages/ (repeatable)")
+    parser.add_argument("--pages", type=str, default=None, metavar="FILE", help="Pages manifest (.txt one page per line, or .json) for many page overrides")
+    parser.add_argument("--force", action="store_true", help="Rewrite persisted files even when only their timestamp changed")
+    parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Batch mode
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE", help="Run queries from FILE (or stdin) and stream NDJSON results")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes for large batches (default: 1), or page override threads")
+    # Instrumentation
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings and counters to stderr")
+    # Server mode
+    parser.add_argument("--serve", action="store_true", help="Run a long-lived search server with warm indexes")
+    parser.add_argument("--host", type=str, default=None, help="Server bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=None, help="Server port (default: 8765)")
+
+    args = parser.parse_args()
+
+    if args.profile:
+        import atexit
+        from core import Profile, set_profile_hook
+        profiler = Profile()
+        set_profile_hook(profiler)
+        atexit.register(lambda: print(profiler.format(), file=sys.stderr))
+
+    if args.serve:
+        from server import serve
+        serve(args.host, args.port)
+        raise SystemExit(0)
+    if args.batch:
+        import json
+        stream = sys.stdin if args.batch == "-" else open(args.batch, 'r', encoding='utf-8')
+        with stream:
+            for result in iter_search_many(read_batch(stream), args.domain, args.stack, args.max_results, args.jobs):
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+        raise SystemExit(0)
+    if args.query is None:
+        parser.error("the following arguments are required: query")
+
+    # Design system takes priority
+    if args.design_system:
+        # Imported here: the generator and its formatters are not needed for plain searches
+        from pathlib import Path
+        from core import stage
+        from design_system import format_ascii_box, format_markdown, get_generator, persist_design_system, load_pages_manifest
+        # Generated once: the printed and the persisted design system are the same dict
+        with stage("generate.load_reasoning"):
+            generator = get_generator()
+        design_system = generator.generate(args.query, args.project_name)
+        with stage(f"format.{args.format}"):
+            print(format_markdown(design_system) if args.format == "markdown" else format_ascii_box(design_system))
+        
+        # Persist and print confirmation
+        if args.persist:
+            pages = (args.page or []) + (load_pages_manifest(args.pages) if args.pages else [])
+            try:
+                with stage("persist"):
+                    persisted = persist_design_system(
+                        design_system,
+                        pages,
+                        args.output_dir,
+                        args.query,
+                        workers=args.jobs,
+                        incremental=not args.force
+                    )
+            except ValueError as e:
+                parser.error(str(e))
+            project_slug = Path(persisted["design_system_dir"]).name
+            print("\n" + "=" * 60)
+            print(f"✅ Design system persisted to design-system/{project_slug}/")
+            for path in persisted["created_files"]:
+                label = "Global Source of Truth" if path.endswith("MASTER.md") else "Page Overrides"
+                status = ", unchanged" if path in persisted["unchanged_files"] else ""
+                print(f"   📄 design-system/{project_slug}/{Path(path).relative_to(persisted['design_system_dir']).as_posix()} ({label}{status})")
+            print("")
+            print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
+            print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
+            print("=" * 60)
+    # Stack search
+    elif args.stack:
+        result = search_stack(args.query, args.stack, args.max_results)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
+    # Domain search
+    else:
+        result = search(args.query, args.domain, args.max_results)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Server - keeps all search indexes warm and answers JSON requests
+Usage: python search.py --serve [--host 127.0.0.1] [--port 8765]
+       python server.py [--host 127.0.0.1] [--port 8765]
+
+Endpoints (localhost HTTP, JSON in/out):
+  POST /search                   {"query": "...", "domain": "color", "max_results": 3}
+  POST /search_stack             {"query": "...", "stack": "react", "max_results": 3}
+  POST /search_domains           {"query": "...", "domains": {"color": 2, "typography": 1}}
+  POST /search_many              {"queries": ["...", {"query": "...", "stack": "react"}], "domain": null}
+  POST /generate_design_system   {"query": "...", "project_name": "...", "output_format": "markdown"}
+  POST /generate_many            {"queries": ["...", {"query": "...", "project_name": "...", "id": 1}]}
+  GET  /health                   {"status": "ok"}
+
+Request bodies are the keyword arguments of the matching core/design_system
+function. Responses are {"result": ...} or {"error": "..."} with a 4xx/5xx status.
+Only application/json requests addressed to this server are accepted (403/415
+otherwise), so web pages open in a browser cannot call it; "workers" is capped
+at MAX_WORKERS.
+Use client.py to call the server with automatic in-process fallback.
+"""
+
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core import search, search_stack, search_domains, search_many
+from urllib.parse import urlsplit
+from design_system import generate_design_system, generate_many, get_generator
+
+
+# ============ CONFIGURATION ============
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_WORKERS = min(4, os.cpu_count() or 1)  # Upper bound for a request's "workers"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+
+METHODS = {
+    "search": search,
+    "search_stack": search_stack,
+    "search_domains": search_domains,
+    "search_many": search_many,
+    "generate_design_system": generate_design_system,
+    "generate_many": generate_many
+}
+
+
+# ============ REQUEST HANDLING ============
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """Dispatches POST /<method> to METHODS with the JSON body as kwargs."""
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, {"status": "ok", "methods": list(METHODS)})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        method = self.path.strip("/")
+        if method not in METHODS:
+            self._send_json(404, {"error": f"Unknown method: {method}. Available: {', '.join(METHODS)}"})
+            return
+
+        # Browsers send cross-origin text/plain POSTs without a preflight, and
+        # DNS rebinding can point a foreign name at 127.0.0.1: accept JSON only,
+        # addressed to this server and from no other origin
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._send_json(415, {"error": "Content-Type must be application/json"})
+            return
+        hosts = self._allowed_hosts()
+        origin = self.headers.get("Origin")
+        if self.headers.get("Host") not in hosts or (origin is not None and urlsplit(origin).netloc not in hosts):
+            self._send_json(403, {"error": "Foreign Host or Origin"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        if not isinstance(params, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+        if params.get("workers") is not None:
+            if not isinstance(params["workers"], int):
+                self._send_json(400, {"error": "workers must be an integer"})
+                return
+            params["workers"] = min(params["workers"], MAX_WORKERS)
+
+        try:
+            result = METHODS[method](**params)
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, {"result": result})
+
+    def _allowed_hosts(self):
+        """host:port values naming this server."""
+        host, port = self.server.server_address[:2]
+        return {f"{name}:{port}" for name in (*LOCAL_HOSTS, host)}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep stderr quiet; the server answers many small requests."""
+        pass
+
+
+def serve(host: str = None, port: int = None):
+    """Preload every index, then serve requests until interrupted."""
+    host = host or DEFAULT_HOST
+    port = port or DEFAULT_PORT
+
+    get_generator(preload_indexes=True)  # Reasoning rules and every domain/stack index
+    httpd = ThreadingHTTPServer((host, port), SearchRequestHandler)
+    httpd.daemon_threads = True
+    print(f"UI Pro Max search server listening on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="UI Pro Max Search Server")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+
+    args = parser.parse_args()
+    serve(args.host, args.port)
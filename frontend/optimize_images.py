@@ -2,87 +2,321 @@
 """
 Optimize Flutter asset images by creating 2x and 3x versions.
 This reduces memory usage by providing appropriately sized images for different device pixel ratios.
+
+Usage: python optimize_images.py [--jobs N] [--force] [--include GLOB] [--exclude GLOB] [--config FILE]
+                                  [--max-memory MB]
+
+The whole IMAGES_DIR tree is walked; variants are written next to each source,
+e.g. avatars/user.png -> avatars/2.0x/user.png and avatars/3.0x/user.png.
+
+CONFIG_FILE declares the logical (1x) display size per image glob; each variant
+fits that box times its scale, keeps the source aspect ratio and is never
+larger than the source.
+
+Builds are incremental: MANIFEST_FILE records the source hash, target size and
+encoder settings behind every output, so unchanged outputs are skipped, stale
+ones rebuilt, and outputs whose source is gone are pruned.
 """
 
 from PIL import Image
+import argparse
+import hashlib
+import io
+import json
 import os
-import glob
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 # Configuration
 IMAGES_DIR = 'assets/images'
 
+# Build cache (not bundled: pubspec only lists subdirectories of IMAGES_DIR)
+MANIFEST_FILE = os.path.join(IMAGES_DIR, '.optimize_images.json')
+MANIFEST_VERSION = 2
+
+# Discovery: glob patterns match paths relative to IMAGES_DIR ('*' also matches '/')
+INCLUDE = ['*.png']
+EXCLUDE = []
+MIN_SIZE = 100000  # 100KB threshold
+
 # Automatically find all PNG images over 100KB
-def find_large_images():
-    """Find all PNG images in the assets directory that are over 100KB."""
-    images = []
-    for img_path in glob.glob(os.path.join(IMAGES_DIR, '*.png')):
-        if os.path.getsize(img_path) > 100000:  # 100KB threshold
-            images.append(os.path.basename(img_path))
-    return sorted(images)
-
-IMAGES = find_large_images()
-
-# Target sizes (in pixels)
-# 1x: 80x80 (base size, we'll keep original for backwards compatibility)
-# 2x: 160x160 (for devices with 2.0 pixel ratio)
-# 3x: 240x240 (for devices with 3.0 pixel ratio)
-SIZES = {
-    '2.0x': 160,
-    '3.0x': 240,
+def find_large_images(include=None, exclude=None):
+    """Yield images under IMAGES_DIR over MIN_SIZE, as paths relative to IMAGES_DIR.
+
+    Walks the tree with os.scandir one directory at a time (sorted, depth
+    first), skipping hidden directories and resolution folders (2.0x, 3.0x).
+    """
+    include = include or INCLUDE
+    exclude = EXCLUDE + (exclude or [])
+    pending = ['']
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(IMAGES_DIR, rel_dir)) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir():
+                if entry.name not in SCALES and not entry.name.startswith('.'):
+                    subdirs.append(rel_path)
+            elif any(fnmatch(rel_path, p) for p in include) \
+                    and not any(fnmatch(rel_path, p) for p in exclude) \
+                    and entry.stat().st_size > MIN_SIZE:
+                yield rel_path
+        pending.extend(reversed(subdirs))
+
+def variant_path(image_name, resolution):
+    """Output path of a resolution variant, next to its source image."""
+    rel_dir, name = os.path.split(image_name)
+    return os.path.join(IMAGES_DIR, rel_dir, resolution, name)
+
+# Variant scales: 2.0x and 3.0x folders hold images at twice / three times the
+# logical size (1x: the original is kept for backwards compatibility)
+SCALES = {
+    '2.0x': 2.0,
+    '3.0x': 3.0,
+}
+
+# Logical 1x display sizes: {"default": box, "images": {glob: box}} where a box
+# has "width" and/or "height" in logical pixels; the first matching glob wins
+CONFIG_FILE = 'optimize_images.json'
+DEFAULT_SIZE = {'width': 80, 'height': 80}
+
+def load_config(path=CONFIG_FILE):
+    """Read the size config; returns (default box, [(glob, box), ...])."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return DEFAULT_SIZE, []
+    return config.get('default', DEFAULT_SIZE), list(config.get('images', {}).items())
+
+def logical_size(image_name, config):
+    """Logical (width, height) box of an image; either side may be None."""
+    default, rules = config
+    box = next((box for pattern, box in rules if fnmatch(image_name, pattern)), default)
+    if not box.get('width') and not box.get('height'):
+        raise ValueError(f"size for {image_name} needs a width or height")
+    return box.get('width'), box.get('height')
+
+def variant_boxes(image_name, config):
+    """{resolution: [width, height] pixel box} for every variant of an image."""
+    width, height = logical_size(image_name, config)
+    return {resolution: [width and round(width * scale), height and round(height * scale)]
+            for resolution, scale in SCALES.items()}
+
+def target_size(source_size, box):
+    """Largest size inside box with the source aspect ratio, never upscaled."""
+    src_width, src_height = source_size
+    box_width, box_height = box
+    ratio = min(box_width / src_width if box_width else float('inf'),
+                box_height / src_height if box_height else float('inf'),
+                1.0)
+    return max(1, round(src_width * ratio)), max(1, round(src_height * ratio))
+
+# Encoder settings; recorded in the manifest so changing them rebuilds outputs
+SETTINGS = {
+    'resample': 'LANCZOS',
+    'format': 'PNG',
+    'optimize': True,
 }
 
-def optimize_image(image_path, output_path, size):
-    """Resize and optimize an image."""
+def load_manifest():
+    """Read the build manifest ({output path: entry}); empty when missing or outdated."""
     try:
-        with Image.open(image_path) as img:
-            # Convert RGBA to RGB if saving as JPEG, otherwise keep as PNG
-            if img.mode == 'RGBA':
-                # Keep PNG format for transparency
-                img_resized = img.resize((size, size), Image.Resampling.LANCZOS)
-                img_resized.save(output_path, 'PNG', optimize=True)
-            else:
-                img_resized = img.resize((size, size), Image.Resampling.LANCZOS)
-                img_resized.save(output_path, 'PNG', optimize=True)
-            
-            print(f"✓ Created {output_path} ({size}x{size})")
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('outputs', {})
+
+def save_manifest(outputs):
+    """Atomically write the build manifest (sorted, so diffs stay small)."""
+    tmp_path = f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'outputs': outputs}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def output_state(output_path):
+    """Hash of a written output, to notice outputs edited by hand (survives git checkouts)."""
+    with open(output_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def peak_rss_mb():
+    """Peak RSS of this process or its largest finished worker, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * unit / 2**20
+
+def check_memory(img, boxes, max_memory):
+    """Raise MemoryError before decoding when an image and its variants exceed max_memory MB.
+
+    PNG decodes whole images, so the decoded source is the floor; resizing
+    only adds the (small) variants and one intermediate pass per variant.
+    """
+    bands = len(img.getbands())
+    needed = img.width * img.height * bands
+    for box in boxes:
+        width, height = target_size(img.size, box)
+        needed += (width * img.height + width * height) * bands
+    if needed > max_memory * 2**20:
+        raise MemoryError(f"{img.width}x{img.height} needs {needed / 2**20:.0f} MB (--max-memory {max_memory})")
+
+def optimize_image(img, output_path, box):
+    """Fit an already decoded image into box, optimize and save it; returns a status line."""
+    try:
+        size = target_size(img.size, box)
+        # Keep PNG format for transparency (RGBA) and everything else alike
+        img_resized = img.resize(size, getattr(Image.Resampling, SETTINGS['resample']))
+        img_resized.save(output_path, SETTINGS['format'], optimize=SETTINGS['optimize'])
+        return f"✓ Created {output_path} ({size[0]}x{size[1]})"
     except Exception as e:
-        print(f"✗ Error processing {image_path}: {e}")
+        return f"✗ Error processing {output_path}: {e}"
+
+def process_image(task):
+    """Rebuild the stale outputs of one source image, decoding it at most once.
+
+    Outputs that exist but are not in the manifest are hand-made variants and
+    are kept unless force is set.
+
+    task is (image_name, {output path: previous manifest entry}, force,
+    {resolution: pixel box}, max_memory MB or None). Runs in
+    a worker process with --jobs; returns (lines to print, {output path: new
+    manifest entry}) so output from parallel workers is not interleaved.
+    """
+    image_name, previous, force, boxes, max_memory = task
+    image_path = os.path.join(IMAGES_DIR, image_name)
+    lines = [f"Processing {image_name}..."]
+    entries = {}
+
+    try:
+        with open(image_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        # Keep tracking the old outputs so a later run rebuilds or prunes them
+        return lines + [f"✗ Error processing {image_path}: {e}"], dict(previous)
+    source_hash = hashlib.sha256(data).hexdigest()
+
+    # Outputs whose source, box, settings and file are unchanged are up to date
+    stale = {}
+    for resolution, box in boxes.items():
+        output_path = variant_path(image_name, resolution)
+        entry = {'source': image_name, 'sha256': source_hash, 'box': box, 'settings': SETTINGS}
+        old = previous.get(output_path)
+        if not force and not old and os.path.exists(output_path):
+            lines.append(f"= Keeping hand-made {output_path}")
+        elif not force and old and all(old.get(k) == v for k, v in entry.items()) \
+                and os.path.exists(output_path) and output_state(output_path) == old.get('output'):
+            entries[output_path] = old
+            lines.append(f"= Up to date {output_path}")
+        else:
+            stale[output_path] = entry
+
+    if not stale:
+        return lines, entries
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max_memory:
+                check_memory(img, [entry['box'] for entry in stale.values()], max_memory)
+            img.load()
+            lines.append(f"  Original size: {img.size[0]}x{img.size[1]}")
+
+            # Create optimized versions for each stale resolution
+            for output_path, entry in stale.items():
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                line = optimize_image(img, output_path, entry['box'])
+                lines.append(line)
+                if line.startswith("✓"):
+                    entries[output_path] = dict(entry, output=output_state(output_path))
+    except Exception as e:
+        lines.append(f"✗ Error processing {image_path}: {e}")
+
+    # Failed outputs keep their old entry: still tracked, and stale next run
+    for output_path in stale:
+        if output_path not in entries and output_path in previous:
+            entries[output_path] = previous[output_path]
+    return lines, entries
+
+def prune_outputs(previous, current):
+    """Delete outputs the manifest tracked that this run no longer produces."""
+    removed = []
+    for output_path in sorted(set(previous) - set(current)):
+        try:
+            os.remove(output_path)
+            removed.append(output_path)
+        except FileNotFoundError:
+            pass
+    return removed
 
 def main():
+    parser = argparse.ArgumentParser(description="Create 2x and 3x versions of large Flutter asset images")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes (default: 1; 0 = one per CPU core)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every output, ignoring the manifest and overwriting hand-made variants")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help=f"Only process matching images (repeatable; default: {' '.join(INCLUDE)})")
+    parser.add_argument("--exclude", action="append", metavar="GLOB", help="Skip matching images (repeatable)")
+    parser.add_argument("--config", default=CONFIG_FILE, help=f"Logical size config (default: {CONFIG_FILE})")
+    parser.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                        help="Per-process memory ceiling; larger images fail before they are decoded")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+    config = load_config(args.config)
+
     print("🎨 Optimizing Flutter asset images...\n")
-    
-    # Create resolution-specific directories
-    for resolution in SIZES.keys():
-        dir_path = os.path.join(IMAGES_DIR, resolution)
-        os.makedirs(dir_path, exist_ok=True)
-        print(f"📁 Created directory: {dir_path}")
-    
-    print()
-    
-    # Process each image
-    for image_name in IMAGES:
-        image_path = os.path.join(IMAGES_DIR, image_name)
-        
-        if not os.path.exists(image_path):
-            print(f"⚠️  Skipping {image_name} (not found)")
-            continue
-        
-        print(f"Processing {image_name}...")
-        
-        # Get original size
-        with Image.open(image_path) as img:
-            original_size = img.size
-            print(f"  Original size: {original_size[0]}x{original_size[1]}")
-        
-        # Create optimized versions for each resolution
-        for resolution, size in SIZES.items():
-            output_dir = os.path.join(IMAGES_DIR, resolution)
-            output_path = os.path.join(output_dir, image_name)
-            optimize_image(image_path, output_path, size)
-        
-        print()
-    
-    print("✅ Optimization complete!")
+
+    # Process each image; one source per task so every worker decodes it once
+    previous = load_manifest()
+    tasks = []
+    for image_name in find_large_images(args.include, args.exclude):
+        outputs = {variant_path(image_name, resolution) for resolution in SCALES}
+        tasks.append((image_name, {k: v for k, v in previous.items() if k in outputs}, args.force,
+                      variant_boxes(image_name, config), args.max_memory))
+
+    if jobs > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        results = executor.map(process_image, tasks)
+    else:
+        executor = None
+        results = map(process_image, tasks)
+
+    current = {}
+    try:
+        for lines, entries in results:
+            current.update(entries)
+            print("\n".join(lines))
+            print()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # --include/--exclude runs cover part of the tree: keep the rest of the manifest
+    if args.include or args.exclude:
+        processed = {variant_path(task[0], resolution) for task in tasks for resolution in SCALES}
+        current.update((k, v) for k, v in previous.items() if k not in processed)
+
+    # Only outputs recorded in the manifest are pruned; hand-made variants are kept
+    for output_path in prune_outputs(previous, current):
+        print(f"🗑  Removed orphaned {output_path}")
+    save_manifest(current)
+
+    peak = peak_rss_mb()
+    print("✅ Optimization complete!" + (f" (peak RSS {peak:.0f} MB)" if peak is not None else ""))
     print("\n📝 Flutter will automatically use the appropriate resolution based on device pixel ratio.")
     print("   - 2.0x images for devices with 2.0 pixel ratio")
     print("   - 3.0x images for devices with 3.0 pixel ratio")
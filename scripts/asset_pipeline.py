@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Asset pipeline: background removal, Flutter resolution variants and PNG
+encoding on a single decode of each source image.
+
+Usage: python3 scripts/asset_pipeline.py [image_path ...] [--stages variants]
+                                         [--mode border] [--jobs N] [--force] [--dry-run]
+                                         [--max-memory MB]
+
+Stages (run in this order, any subset; default: variants only):
+  remove_bg  make the white background transparent (see remove_bg.py)
+  source     write the processed 1x image back over the source, if it changed
+  variants   write 2.0x/3.0x variants next to the source (see optimize_images.py)
+
+Without image paths, every large image under frontend/assets/images is
+processed. The source stage overwrites shipped images, so it only runs with
+explicit image paths. Each source is read from disk once and each output written once.
+Variants are recorded in the optimize_images.py manifest when they match the
+source on disk, so later optimize_images.py runs treat them as up to date.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FRONTEND_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), 'frontend')
+sys.path.insert(0, FRONTEND_DIR)
+
+import optimize_images
+from remove_bg import FEATHER_RADIUS, memory_strip_rows, remove_background
+
+STAGES = ['remove_bg', 'source', 'variants']
+DEFAULT_STAGES = ['variants']  # Never rewrites sources unless asked to
+
+def process_asset(task):
+    """Run the stages on one image, decoding it once; returns (lines, manifest entries).
+
+    task is (image_name, stages, mode, feather, {output path: pixel box}, dry_run,
+    max_memory MB or None), with paths relative to the frontend directory. A None
+    entry means the output must no longer be tracked by the manifest.
+    """
+    image_name, stages, mode, feather, boxes, dry_run, max_memory = task
+    image_path = os.path.join(optimize_images.IMAGES_DIR, image_name)
+    lines = [f"Processing {image_name}..."]
+    entries = {}
+    start = time.perf_counter()
+
+    try:
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        with Image.open(io.BytesIO(data)) as source:
+            rows = None
+            if max_memory:
+                if 'variants' in stages:
+                    optimize_images.check_memory(source, list(boxes.values()), max_memory)
+                if 'remove_bg' in stages:
+                    rows = memory_strip_rows(source.size, source.mode, mode, max_memory)
+            source.load()
+            img = source
+            lines.append(f"  Original size: {img.size[0]}x{img.size[1]}")
+
+            source_matches = True  # Are variants derived from the file on disk?
+            if 'remove_bg' in stages:
+                img, cleared, changed = remove_background(img, mode, feather, rows)
+                lines.append(f"  Background: {cleared}/{img.width * img.height} px"
+                             + ("" if changed else " (unchanged)"))
+
+                if changed and 'source' in stages:
+                    buffer = io.BytesIO()
+                    img.save(buffer, 'PNG')
+                    data = buffer.getvalue()
+                    if not dry_run:
+                        # Temp file + rename: a failed write never loses the original
+                        tmp_path = f"{image_path}.{os.getpid()}.tmp"
+                        try:
+                            with open(tmp_path, 'wb') as f:
+                                f.write(data)
+                            os.replace(tmp_path, image_path)
+                        except BaseException:
+                            if os.path.exists(tmp_path):
+                                os.remove(tmp_path)
+                            raise
+                    lines.append(f"{'~ Would write' if dry_run else '✓ Wrote'} {image_path}")
+                source_matches = not changed or ('source' in stages and not dry_run)
+
+            if 'variants' in stages:
+                source_hash = hashlib.sha256(data).hexdigest()
+                for output_path, box in boxes.items():
+                    if dry_run:
+                        size = optimize_images.target_size(img.size, box)
+                        lines.append(f"~ Would create {output_path} ({size[0]}x{size[1]})")
+                        continue
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                    line = optimize_images.optimize_image(img, output_path, box)
+                    lines.append(line)
+                    if not line.startswith("✓"):
+                        continue
+                    # Variants of a source that differs from the file on disk are
+                    # untracked (hand-made), so optimize_images.py leaves them alone
+                    entries[output_path] = None if not source_matches else {
+                        'source': image_name, 'sha256': source_hash, 'box': box,
+                        'settings': optimize_images.SETTINGS,
+                        'output': optimize_images.output_state(output_path),
+                    }
+    except Exception as e:
+        lines.append(f"✗ Error processing {image_path}: {e or type(e).__name__}")
+
+    lines.append(f"  Done in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return lines, entries
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove backgrounds, resize and encode assets on one decode")
+    parser.add_argument("paths", nargs="*", metavar="image_path",
+                        help="Images to process (default: every large image under frontend/assets/images)")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"Comma-separated stages to run, from {','.join(STAGES)} (default: {','.join(DEFAULT_STAGES)})")
+    parser.add_argument("--mode", choices=["threshold", "border"], default="threshold",
+                        help="Background removal mode (see remove_bg.py)")
+    parser.add_argument("--feather", type=int, default=FEATHER_RADIUS, help="Border mode edge feathering in pixels")
+    parser.add_argument("--config", default=optimize_images.CONFIG_FILE, help="Logical size config, relative to frontend/")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (default: 1; 0 = one per CPU core)")
+    parser.add_argument("--force", action="store_true", help="Overwrite hand-made variants not tracked by the manifest")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be written without writing")
+    parser.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                        help="Per-process memory ceiling; background removal runs in strips that fit")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    if 'source' in stages and not args.paths:
+        parser.error("the source stage overwrites images in place; pass the image paths to rewrite")
+
+    # optimize_images.py paths (assets, config, manifest) are relative to frontend/
+    paths = [os.path.abspath(path) for path in args.paths]
+    os.chdir(FRONTEND_DIR)
+    if paths:
+        images = [os.path.relpath(path, optimize_images.IMAGES_DIR) for path in paths]
+    else:
+        images = list(optimize_images.find_large_images())
+
+    config = optimize_images.load_config(args.config)
+    previous = optimize_images.load_manifest()
+    tasks = []
+    for image_name in images:
+        boxes = {}
+        for resolution, box in optimize_images.variant_boxes(image_name, config).items():
+            output_path = optimize_images.variant_path(image_name, resolution)
+            if not args.force and output_path not in previous and os.path.exists(output_path):
+                print(f"= Keeping hand-made {output_path}")
+                continue
+            boxes[output_path] = box
+        tasks.append((image_name, stages, args.mode, args.feather, boxes, args.dry_run, args.max_memory))
+
+    print(f"🎨 Running {' → '.join(s for s in STAGES if s in stages)} on {len(tasks)} images...\n")
+    jobs = args.jobs or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) if jobs > 1 and len(tasks) > 1 else None
+    current = dict(previous)
+    try:
+        for lines, entries in (executor.map(process_asset, tasks) if executor else map(process_asset, tasks)):
+            for output_path, entry in entries.items():
+                if entry is None:
+                    current.pop(output_path, None)
+                else:
+                    current[output_path] = entry
+            print("\n".join(lines))
+            print()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if current != previous:
+        optimize_images.save_manifest(current)
+    peak = optimize_images.peak_rss_mb()
+    print("✅ Pipeline complete!" + (f" (peak RSS {peak:.0f} MB)" if peak is not None else "")
+          + (" (dry run)" if args.dry_run else ""))
+
+if __name__ == '__main__':
+    main()
@@ -1,34 +1,301 @@
-from PIL import Image
-import sys
+from PIL import Image, ImageChops, ImageFilter
+import argparse
+import glob
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def remove_white_bg(image_path):
-    try:
-        img = Image.open(image_path)
+# Channels above this value count as white (all three must be)
+THRESHOLD = 240
+TRANSPARENT = (255, 255, 255, 0)
+
+# Per-band lookup table: 255 where the channel is near white, 0 elsewhere
+WHITE_LUT = [255 if v > THRESHOLD else 0 for v in range(256)]
+
+# Border mode: pixels within FEATHER_RADIUS of the removed background get alpha
+# from their darkest channel, fully opaque at FEATHER_LOW and below
+FEATHER_RADIUS = 1
+FEATHER_LOW = 160
+FEATHER_LUT = [255 if v <= FEATHER_LOW else (255 - v) * 255 // (255 - FEATHER_LOW) for v in range(256)]
+
+# Strip processing: images are processed STRIP_MEMORY_MB worth of rows at a
+# time; each row needs about STRIP_BYTES_PER_PIXEL bytes per pixel of temporaries
+STRIP_MEMORY_MB = 64
+STRIP_BYTES_PER_PIXEL = 24
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_mb():
+    """Peak RSS of this process or its largest finished worker, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * unit / 2**20
+
+def strip_rows(width, budget_mb=STRIP_MEMORY_MB):
+    """Rows per strip that keep strip temporaries within budget_mb."""
+    return max(1, int(budget_mb * 2**20) // (width * STRIP_BYTES_PER_PIXEL))
+
+def memory_strip_rows(size, source_mode, mode, max_memory_mb):
+    """Rows per strip that keep a whole run within max_memory_mb, or MemoryError.
+
+    Whole-image buffers (decoded source, RGBA copy, border mode masks) count
+    against the ceiling first; the rest is the strip budget.
+    """
+    width, height = size
+    per_pixel = 4 + (Image.getmodebands(source_mode) if source_mode != "RGBA" else 0)
+    if mode == "border":
+        per_pixel += 3  # White mask, filled mask and the background image
+    budget = max_memory_mb * 2**20 - width * height * per_pixel
+    if budget < width * STRIP_BYTES_PER_PIXEL:
+        needed = (width * height * per_pixel + width * STRIP_BYTES_PER_PIXEL) / 2**20
+        raise MemoryError(f"{width}x{height} needs at least {needed:.0f} MB (--max-memory {max_memory_mb})")
+    return budget // (width * STRIP_BYTES_PER_PIXEL)
+
+def strips(height, rows):
+    """(top, bottom) row ranges covering the image."""
+    for top in range(0, height, rows):
+        yield top, min(top + rows, height)
+
+def white_mask(img):
+    """'L' mask that is 255 where R, G and B are all above THRESHOLD, 0 elsewhere."""
+    r, g, b = (band.point(WHITE_LUT) for band in img.split()[:3])
+    return ImageChops.multiply(ImageChops.multiply(r, g), b)
+
+def border_mask(img, rows=None):
+    """'L' mask of the near-white pixels connected (4-way) to the image border.
+
+    Scanline flood fill over the white mask's bytes: every white run is found
+    with bytearray.find, filled once and scanned once per neighbouring row, so
+    the fill is linear in the number of pixels. The white mask is built a
+    strip of rows at a time.
+    """
+    width, height = img.size
+    rows = rows or strip_rows(width)
+    white = bytearray(width * height)
+    for top, bottom in strips(height, rows):
+        white[top * width:bottom * width] = white_mask(img.crop((0, top, width, bottom))).tobytes()
+    filled = bytearray(width * height)
+
+    def run_end(row, x):
+        end = white.find(b'\x00', row + x, row + width)
+        return width if end == -1 else end - row
+
+    def push_runs(y, left, right):
+        """Queue one seed per unfilled white run of row y overlapping [left, right)."""
+        row = y * width
+        x = left
+        while x < right:
+            start = white.find(b'\xff', row + x, row + right)
+            if start == -1:
+                return
+            x = start - row
+            if not filled[row + x]:
+                seeds.append((y, x))
+            x = run_end(row, x)
+
+    # Seeds: every white run on the top and bottom rows, every white pixel on the sides
+    seeds = []
+    push_runs(0, 0, width)
+    push_runs(height - 1, 0, width)
+    for y in range(1, height - 1):
+        for x in (0, width - 1):
+            if white[y * width + x]:
+                seeds.append((y, x))
+
+    while seeds:
+        y, x = seeds.pop()
+        row = y * width
+        if filled[row + x]:
+            continue
+        # A run is always filled whole, so an unfilled seed means an unfilled run
+        left = white.rfind(b'\x00', row, row + x) + 1
+        left = max(left, row) - row
+        right = run_end(row, x)
+        filled[row + left:row + right] = b'\xff' * (right - left)
+        if y > 0:
+            push_runs(y - 1, left, right)
+        if y < height - 1:
+            push_runs(y + 1, left, right)
+
+    return Image.frombuffer("L", (width, height), filled, "raw", "L", 0, 1)
+
+def feather_edges(img, background, radius=FEATHER_RADIUS, rows=None):
+    """Soften alpha on the anti-aliased pixels around background ('L' mask).
+
+    Works a strip of rows at a time; each strip reads radius extra rows of the
+    mask on either side so the edge band matches a whole-image pass. Returns
+    True when any alpha value changed.
+    """
+    width, height = img.size
+    rows = rows or strip_rows(width)
+    changed = False
+    for top, bottom in strips(height, rows):
+        outer_top, outer_bottom = max(0, top - radius), min(height, bottom + radius)
+        mask = background.crop((0, outer_top, width, outer_bottom))
+        band = ImageChops.subtract(mask.filter(ImageFilter.MaxFilter(2 * radius + 1)), mask)
+        band = band.crop((0, top - outer_top, width, bottom - outer_top))
+
+        r, g, b, a = img.crop((0, top, width, bottom)).split()
+        soft = ImageChops.darker(ImageChops.darker(r, g), b).point(FEATHER_LUT)
+        feathered = a.copy()
+        feathered.paste(ImageChops.darker(a, soft), mask=band)
+        if feathered.tobytes() != a.tobytes():
+            img.paste(Image.merge("RGBA", (r, g, b, feathered)), (0, top))
+            changed = True
+    return changed
+
+def remove_background(img, mode="threshold", feather=FEATHER_RADIUS, rows=None):
+    """Make the white background of a decoded image transparent, a strip at a time.
+
+    mode "threshold" clears every near-white pixel; mode "border" clears only
+    near-white areas connected to the image border (keeping white highlights
+    inside the subject) and feathers the alpha of the edge pixels next to them.
+    RGBA images are modified in place, others are converted first. rows sets
+    the strip height (default: from STRIP_MEMORY_MB).
+    Returns (RGBA image, background pixels made transparent, whether any pixel changed).
+    """
+    if img.mode != "RGBA":
         img = img.convert("RGBA")
-        datas = img.getdata()
-
-        newData = []
-        for item in datas:
-            # Change all white (and near white) pixels to transparent
-            if item[0] > 240 and item[1] > 240 and item[2] > 240:
-                newData.append((255, 255, 255, 0))
-            else:
-                newData.append(item)
-
-        img.putdata(newData)
-        img.save(image_path, "PNG")
-        print(f"Successfully processed: {image_path}")
+    width, height = img.size
+    rows = rows or strip_rows(width)
+
+    background, changed = None, False
+    if mode == "border":
+        background = border_mask(img, rows)
+        if feather:
+            changed = feather_edges(img, background, feather, rows)
+
+    # Change white (and near white) pixels to transparent, in bulk per strip
+    cleared = 0
+    for top, bottom in strips(height, rows):
+        box = (0, top, width, bottom)
+        mask = background.crop(box) if background is not None else white_mask(img.crop(box))
+        cleared += mask.histogram()[255]
+        if not changed:
+            before = img.crop(box).tobytes()
+        img.paste(TRANSPARENT, box, mask=mask)
+        if not changed:
+            changed = img.crop(box).tobytes() != before
+    return img, cleared, changed
+
+def remove_white_bg(image_path, mode="threshold", feather=FEATHER_RADIUS, output_path=None, dry_run=False,
+                    max_memory=None):
+    """Remove the white background of one file; returns a stats dict.
+
+    Writes to output_path (default: in place). In place, the file is only
+    rewritten when at least one pixel changed. dry_run computes everything
+    but writes nothing. max_memory (MB) caps the working memory: strips are
+    sized to fit, and images that cannot fit fail before they are decoded.
+    """
+    output_path = output_path or image_path
+    stats = {"path": image_path, "output": output_path, "pixels": 0, "cleared": 0,
+             "changed": False, "written": False, "ms": 0.0, "error": None}
+    start = time.perf_counter()
+    try:
+        with Image.open(image_path) as source:
+            rows = memory_strip_rows(source.size, source.mode, mode, max_memory) if max_memory else None
+            source.load()
+            img, stats["cleared"], stats["changed"] = remove_background(source, mode, feather, rows)
+            stats["pixels"] = img.width * img.height
+
+            if not dry_run and (stats["changed"] or output_path != image_path):
+                if os.path.dirname(output_path):
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                img.save(output_path, "PNG")
+                stats["written"] = True
     except Exception as e:
-        print(f"Error processing {image_path}: {e}")
+        stats["error"] = str(e) or type(e).__name__
+    stats["ms"] = (time.perf_counter() - start) * 1000
+    return stats
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        # Process all files passed as arguments
-        for file_path in sys.argv[1:]:
-            if os.path.exists(file_path):
-                remove_white_bg(file_path)
-            else:
-                print(f"File not found: {file_path}")
+def _run_task(task):
+    """Process-pool entry point: task is (image_path, output_path, mode, feather, dry_run, max_memory)."""
+    image_path, output_path, mode, feather, dry_run, max_memory = task
+    return remove_white_bg(image_path, mode, feather, output_path, dry_run, max_memory)
+
+def collect_images(paths, output_dir=None):
+    """Expand files, directories (recursive) and globs into (image_path, output_path) pairs.
+
+    With output_dir, outputs keep their path relative to the directory or glob
+    they were found under; otherwise images are processed in place.
+    """
+    tasks, missing = [], []
+    for path in paths:
+        if os.path.isdir(path):
+            root = path
+            found = sorted(os.path.join(d, f) for d, dirs, files in os.walk(path)
+                           for f in files if f.lower().endswith(".png"))
+        elif os.path.isfile(path):
+            root, found = os.path.dirname(path), [path]
+        else:
+            root = path.split("*", 1)[0].split("?", 1)[0].split("[", 1)[0]
+            root = root if root.endswith(os.sep) else os.path.dirname(root)
+            found = sorted(f for f in glob.glob(path, recursive=True) if os.path.isfile(f))
+            if not found:
+                missing.append(path)
+        for image_path in found:
+            output_path = os.path.join(output_dir, os.path.relpath(image_path, root or ".")) if output_dir else image_path
+            tasks.append((image_path, output_path))
+    return tasks, missing
+
+def format_stats(stats):
+    """One report line per file."""
+    if stats["error"]:
+        return f"Error processing {stats['path']}: {stats['error']}"
+    if stats["written"]:
+        action = f"Successfully processed: {stats['output']}"
+    elif stats["changed"]:
+        action = f"Would write: {stats['output']}"
     else:
-        print("Usage: python3 remove_bg.py <image_path1> [image_path2 ...]")
+        action = f"Unchanged: {stats['path']}"
+    return f"{action} ({stats['cleared']}/{stats['pixels']} px background, {stats['ms']:.0f} ms)"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Make white image backgrounds transparent",
+                                     usage="python3 remove_bg.py <image_path|dir|glob> [...] [--mode border] [--output-dir DIR] [--jobs N] [--dry-run] [--max-memory MB]")
+    parser.add_argument("paths", nargs="+", metavar="image_path", help="PNG files, directories (recursive) or globs")
+    parser.add_argument("--mode", choices=["threshold", "border"], default="threshold",
+                        help="threshold: every near-white pixel (default); border: only background connected to the edges")
+    parser.add_argument("--feather", type=int, default=FEATHER_RADIUS,
+                        help=f"Border mode: edge width in pixels with soft alpha, 0 for hard edges (default: {FEATHER_RADIUS})")
+    parser.add_argument("--output-dir", "-o", default=None,
+                        help="Write results here (keeping relative paths) instead of in place")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (default: 1; 0 = one per CPU core)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing files")
+    parser.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                        help="Working memory ceiling per process; images are processed in strips that fit")
+    args = parser.parse_args()
+
+    pairs, missing = collect_images(args.paths, args.output_dir)
+    for path in missing:
+        print(f"File not found: {path}")
+
+    tasks = [(image_path, output_path, args.mode, args.feather, args.dry_run, args.max_memory)
+             for image_path, output_path in pairs]
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) if jobs > 1 and len(tasks) > 1 else None
+    results = []
+    try:
+        for stats in (executor.map(_run_task, tasks) if executor else map(_run_task, tasks)):
+            print(format_stats(stats))
+            results.append(stats)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    written = sum(stats["written"] for stats in results)
+    changed = sum(stats["changed"] for stats in results)
+    errors = sum(bool(stats["error"]) for stats in results)
+    peak = peak_rss_mb()
+    print(f"\n{len(results)} files, {changed} changed, {written} written, {errors} errors, "
+          f"{sum(stats['cleared'] for stats in results)} background px in {time.perf_counter() - start:.2f} s"
+          + (f", peak RSS {peak:.0f} MB" if peak is not None else "")
+          + (" (dry run)" if args.dry_run else ""))